@@ -0,0 +1,199 @@
+import importlib.util
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+
+from backend.cache import TTLCache
+from backend.config import CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL, CATALOG_CACHE_URL, REPLICA_MAX_LAG
+from schemas.metrics import CatalogCacheStats
+from schemas.products import ProductList, ProductListFilter
+
+VERSION_KEY = "catalog:version"
+BUMPED_AT_KEY = "catalog:bumped_at"
+
+
+class SharedCache(ABC):
+    """Storage shared by all workers: serialized pages and the catalog version.
+
+    The version is a counter bumped on every catalog write together with the
+    wall clock time of the bump.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def version(self) -> tuple[int, float]: ...
+
+    @abstractmethod
+    async def bump(self) -> None: ...
+
+
+class MemorySharedCache(SharedCache):
+    """In-process stand-in for a shared tier, only consistent within one worker.
+
+    Selected with ``CATALOG_CACHE_URL=memory://``, for single worker deployments.
+    """
+
+    name = "memory"
+
+    def __init__(self, size: int, ttl: float):
+        self._entries = TTLCache(size=size, ttl=ttl)
+        self._version = 0
+        self._bumped_at = 0.0
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl)
+
+    async def version(self) -> tuple[int, float]:
+        return self._version, self._bumped_at
+
+    async def bump(self) -> None:
+        self._version += 1
+        self._bumped_at = time.time()
+        self._entries.clear()
+
+
+class RedisSharedCache(SharedCache):
+    name = "redis"
+
+    def __init__(self, url: str):
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def version(self) -> tuple[int, float]:
+        version, bumped_at = await self._redis.mget(VERSION_KEY, BUMPED_AT_KEY)
+        return int(version or 0), float(bumped_at or 0)
+
+    async def bump(self) -> None:
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.incr(VERSION_KEY)
+            pipeline.set(BUMPED_AT_KEY, time.time())
+            await pipeline.execute()
+
+
+class CatalogCache:
+    """Two-tier cache of /products/list pages keyed by the catalog version.
+
+    Writes bump the version instead of deleting entries, so a page is only
+    found under the version that was current when its query started and no
+    page read before a write is served after it. Pages read from a replica
+    shortly after a bump are not stored, as the replica may not have the
+    write yet.
+
+    Without a shared tier the cache is off: a version bumped in one worker
+    would not reach the others, which would keep serving the old stock.
+    """
+
+    def __init__(self, size: int, ttl: float, shared: SharedCache | None, replica_lag: float):
+        self.ttl = ttl if shared is not None else 0
+        self.shared = shared
+        self.replica_lag = replica_lag
+        self._local = TTLCache(size=size, ttl=self.ttl)
+        self.bumps = 0
+        self.shared_hits = 0
+        self.shared_misses = 0
+
+    @staticmethod
+    def normalize_keyword(keyword: str) -> str:
+        return " ".join(keyword.split())
+
+    @classmethod
+    def key(cls, products_list_filter: ProductListFilter) -> Hashable:
+        pagination = products_list_filter.pagination
+        return (
+            cls.normalize_keyword(products_list_filter.keyword).lower(),
+            pagination.page,
+            pagination.per_page,
+            pagination.after,
+            pagination.count_strategy,
+            products_list_filter.search_description,
+            products_list_filter.order_by_relevance,
+        )
+
+    @staticmethod
+    def _shared_key(version: int, key: Hashable) -> str:
+        return f"catalog:{version}:{'|'.join(map(str, key))}"
+
+    async def get(self, key: Hashable) -> tuple[int, float, ProductList | None]:
+        """Cached page for ``key`` and the version to store a fresh page under."""
+        if self.ttl <= 0:
+            return 0, 0.0, None
+
+        version, bumped_at = await self.shared.version()
+        products = self._local.get((version, key))
+        if products is None:
+            payload = await self.shared.get(self._shared_key(version, key))
+            if payload is None:
+                self.shared_misses += 1
+            else:
+                self.shared_hits += 1
+                products = ProductList.model_validate_json(payload)
+                self._local.set((version, key), products)
+        return version, bumped_at, products
+
+    async def set(
+        self, key: Hashable, version: int, bumped_at: float, products: ProductList, from_replica: bool = False
+    ) -> None:
+        if self.ttl <= 0:
+            return
+        if from_replica and time.time() - bumped_at < self.replica_lag:
+            return
+        self._local.set((version, key), products)
+        await self.shared.set(self._shared_key(version, key), products.serialize_str().encode(), self.ttl)
+
+    async def bump(self) -> None:
+        self.bumps += 1
+        self._local.clear()
+        if self.shared is not None:
+            await self.shared.bump()
+
+    async def stats(self) -> CatalogCacheStats:
+        """Counters of this worker's local tier and of its lookups in the shared tier."""
+        version, bumped_at = await self.shared.version() if self.shared is not None else (0, 0.0)
+        return CatalogCacheStats(
+            enabled=self.ttl > 0,
+            shared_tier=self.shared.name if self.shared is not None else None,
+            version=version,
+            bumped_at=bumped_at,
+            size=self._local.size,
+            entries=len(self._local),
+            hits=self._local.hits,
+            misses=self._local.misses,
+            shared_hits=self.shared_hits,
+            shared_misses=self.shared_misses,
+            bumps=self.bumps,
+        )
+
+
+def create_shared_cache(url: str | None) -> SharedCache | None:
+    if not url:
+        return None
+    if url == "memory://":
+        return MemorySharedCache(size=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL)
+    if importlib.util.find_spec("redis") is None:
+        raise RuntimeError("CATALOG_CACHE_URL is set but the redis package is not installed")
+    return RedisSharedCache(url)
+
+
+catalog_cache = CatalogCache(
+    size=CATALOG_CACHE_SIZE,
+    ttl=CATALOG_CACHE_TTL,
+    shared=create_shared_cache(CATALOG_CACHE_URL),
+    replica_lag=REPLICA_MAX_LAG,
+)
@@ -18,4 +18,61 @@ API_ROOT_PREFIX = os.getenv("API_ROOT_PREFIX")
 SECRET_KEY = os.getenv("SECRET_KEY")
 SECURITY_ALGORITHM = os.getenv("SECURITY_ALGORITHM")
 
-TEMPLATES = Jinja2Templates(directory="templates")
+TEMPLATES_DIRECTORY = "templates"
+TEMPLATES = Jinja2Templates(directory=TEMPLATES_DIRECTORY)
+
+# PDF rendering settings
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", 2))
+PDF_QUEUE_SIZE = int(os.getenv("PDF_QUEUE_SIZE", 8))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", 30))
+PDF_RETRY_AFTER = int(os.getenv("PDF_RETRY_AFTER", 5))
+
+# PDF cache settings
+PDF_CACHE_SIZE = int(os.getenv("PDF_CACHE_SIZE", 128))
+PDF_CACHE_DIRECTORY = os.getenv("PDF_CACHE_DIRECTORY")
+PDF_CACHE_DISK_BYTES = int(os.getenv("PDF_CACHE_DISK_BYTES", 256 * 1024 * 1024))
+
+# Pagination settings
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 1024))
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", 30))
+
+# Verified JWT claims cache settings
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 4096))
+JWT_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", 300))
+
+# Employee directory cache, kept per worker: other workers see user changes after the TTL
+EMPLOYEE_CACHE_SIZE = int(os.getenv("EMPLOYEE_CACHE_SIZE", 256))
+EMPLOYEE_CACHE_TTL = float(os.getenv("EMPLOYEE_CACHE_TTL", 60))
+
+# Password hashing settings
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+
+# Database connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Set both cache sizes to 0 behind pgbouncer in transaction pooling mode
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100))
+
+# Read replica settings, DATABASE_REPLICA_URLS is a comma separated list of SQLAlchemy URLs
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", 10))
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 5))
+REPLICA_STICKINESS = int(os.getenv("REPLICA_STICKINESS", 10))
+
+# Encode responses with pydantic's native serializer, skipping response re-validation
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Product catalog response cache, off unless CATALOG_CACHE_URL names the shared tier:
+# a redis:// URL, or memory:// for a single worker deployment
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", 1024))
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", 30))
+CATALOG_CACHE_URL = os.getenv("CATALOG_CACHE_URL")
+
+# Instrumentation settings
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", 20))
@@ -3,6 +3,12 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.replicas import get_read_session
 from backend.session import get_session
+from schemas.security import TokenDataSchema
+from services import SecurityService
 
 SessionDependency = Annotated[AsyncSession, Depends(get_session)]
+# Read-only endpoints, may be served by a replica
+ReadSessionDependency = Annotated[AsyncSession, Depends(get_read_session)]
+PrincipalDependency = Annotated[TokenDataSchema, Depends(SecurityService.get_principal)]
@@ -0,0 +1,28 @@
+import json
+from typing import Any
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` wrapper for any selectable statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+def parse_plan(raw: Any) -> dict[str, Any]:
+    """Return the top plan node from the value of an ``EXPLAIN (FORMAT JSON)`` row."""
+    if isinstance(raw, str):
+        raw = json.loads(raw)
+    return raw[0]["Plan"]
@@ -0,0 +1,256 @@
+import contextvars
+import heapq
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import SERVER_TIMING, SLOW_QUERY_LOG_SIZE
+from schemas.metrics import SlowQuery
+
+# Upper bounds in seconds, the last bucket is +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# Longest statement text kept in the slow query log
+SLOW_QUERY_TEXT_LIMIT = 2000
+
+
+class Histogram:
+    """Cumulative Prometheus histogram, one series per label set."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        counts = series[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+        series[1] += value
+        series[2] += 1
+
+    @staticmethod
+    def _labels(pairs: list[tuple[str, str]]) -> str:
+        if not pairs:
+            return ""
+        escaped = (name + '="' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for name, value in pairs)
+        return "{" + ",".join(escaped) + "}"
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            pairs = list(zip(self.label_names, labels))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{self._labels(pairs + [('le', f'{bound:g}')])} {bucket_count}")
+            lines.append(f"{self.name}_bucket{self._labels(pairs + [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{self._labels(pairs)} {total:.6f}")
+            lines.append(f"{self.name}_count{self._labels(pairs)} {count}")
+        return lines
+
+
+class RequestTimings:
+    """Time spent by the current request, per operation."""
+
+    __slots__ = ("queries", "durations")
+
+    def __init__(self):
+        self.queries = 0
+        self.durations: dict[str, float] = {}
+
+    def add(self, operation: str, seconds: float) -> None:
+        self.durations[operation] = self.durations.get(operation, 0.0) + seconds
+
+
+_request_timings: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class Instrumentation:
+    """Request, SQL and expensive operation timings exported in Prometheus text format."""
+
+    def __init__(self, slow_query_log_size: int):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "Time until the response was sent, by route.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS,
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries",
+            "SQL statements executed per request, by route.",
+            ("method", "route"),
+            QUERY_COUNT_BUCKETS,
+        )
+        self.request_db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Total SQL execution time per request, by route.",
+            ("method", "route"),
+            LATENCY_BUCKETS,
+        )
+        self.query_duration = Histogram(
+            "db_query_duration_seconds",
+            "Execution time of single SQL statements.",
+            (),
+            LATENCY_BUCKETS,
+        )
+        self.operation_duration = Histogram(
+            "operation_duration_seconds",
+            "Time spent in bcrypt, JWT and WeasyPrint.",
+            ("operation",),
+            LATENCY_BUCKETS,
+        )
+        self.slow_query_log_size = slow_query_log_size
+        # min-heap of (seconds, sequence, SlowQuery), the fastest entry is evicted first
+        self._slow_queries: list[tuple[float, int, SlowQuery]] = []
+        self._sequence = 0
+
+    def record(self, operation: str, seconds: float) -> None:
+        self.operation_duration.observe(seconds, operation)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.add(operation, seconds)
+
+    @contextmanager
+    def timed(self, operation: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(operation, time.perf_counter() - started)
+
+    @staticmethod
+    def redact(parameters) -> list | dict | None:
+        """Replace parameter values by their type names."""
+        if parameters is None:
+            return None
+        if isinstance(parameters, dict):
+            return {name: type(value).__name__ for name, value in parameters.items()}
+        if isinstance(parameters, (list, tuple)):
+            if parameters and isinstance(parameters[0], (list, tuple, dict)):
+                # executemany, the shape of the first row is enough
+                return [Instrumentation.redact(parameters[0]), f"... {len(parameters)} rows"]
+            return [type(value).__name__ for value in parameters]
+        return [type(parameters).__name__]
+
+    def record_query(self, statement: str, parameters, seconds: float) -> None:
+        self.query_duration.observe(seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.queries += 1
+            timings.add("db", seconds)
+
+        if self.slow_query_log_size <= 0:
+            return
+        if len(self._slow_queries) >= self.slow_query_log_size and seconds <= self._slow_queries[0][0]:
+            return
+        self._sequence += 1
+        entry = SlowQuery(
+            statement=statement[:SLOW_QUERY_TEXT_LIMIT],
+            parameters=self.redact(parameters),
+            duration_seconds=seconds,
+            recorded_at=time.time(),
+        )
+        if len(self._slow_queries) >= self.slow_query_log_size:
+            heapq.heapreplace(self._slow_queries, (seconds, self._sequence, entry))
+        else:
+            heapq.heappush(self._slow_queries, (seconds, self._sequence, entry))
+
+    def slow_queries(self) -> list[SlowQuery]:
+        return [entry for _, _, entry in sorted(self._slow_queries, reverse=True)]
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """Time every cursor execution of ``engine`` (the sync engine of an async one)."""
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+            connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+            started = connection.info["query_started"].pop()
+            self.record_query(statement, parameters, time.perf_counter() - started)
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("query_started"):
+                connection.info["query_started"].pop()
+
+    def render(self) -> str:
+        lines = []
+        for histogram in (
+            self.request_duration,
+            self.request_queries,
+            self.request_db_duration,
+            self.query_duration,
+            self.operation_duration,
+        ):
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+instrumentation = Instrumentation(slow_query_log_size=SLOW_QUERY_LOG_SIZE)
+
+
+def route_path(scope: Scope) -> str:
+    """Path template of the matched route, raw paths would give unbounded label values."""
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+def server_timing(timings: RequestTimings, total: float) -> str:
+    metrics = [f"app;dur={total * 1000:.1f}"]
+    for operation, seconds in timings.durations.items():
+        description = f';desc="{timings.queries} queries"' if operation == "db" else ""
+        metrics.append(f"{operation};dur={seconds * 1000:.1f}{description}")
+    return ", ".join(metrics)
+
+
+class InstrumentationMiddleware:
+    """Records latency and SQL usage of every HTTP request and adds a Server-Timing header.
+
+    The latency is measured until the response starts, so streamed bodies
+    (exports, imports) are counted up to their first chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                instrumentation.request_duration.observe(
+                    elapsed, scope["method"], route_path(scope), str(message["status"])
+                )
+                if SERVER_TIMING:
+                    MutableHeaders(scope=message).append("server-timing", server_timing(timings, elapsed))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            route = route_path(scope)
+            instrumentation.request_queries.observe(timings.queries, scope["method"], route)
+            instrumentation.request_db_duration.observe(timings.durations.get("db", 0.0), scope["method"], route)
@@ -0,0 +1,38 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from backend.config import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS
+from backend.instrumentation import instrumentation
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool so hashing never blocks the event loop.
+
+    The pool size caps how many hashes run at once; bcrypt releases the GIL,
+    so the workers really run in parallel. Hashes made with a different cost
+    than ``rounds`` are reported for rehashing by ``verify_and_update``.
+    """
+
+    def __init__(self, rounds: int, workers: int):
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        with instrumentation.timed("bcrypt"):
+            return await loop.run_in_executor(self._executor, function, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._run(self.context.verify, password, password_hash)
+
+    async def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, str | None]:
+        """Return whether ``password`` matches and a new hash if the stored one is outdated."""
+        return await self._run(self.context.verify_and_update, password, password_hash)
+
+
+password_hasher = PasswordHasher(rounds=BCRYPT_ROUNDS, workers=PASSWORD_HASH_WORKERS)
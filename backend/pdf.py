@@ -0,0 +1,148 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from backend.config import (
+    PDF_QUEUE_SIZE,
+    PDF_RENDER_TIMEOUT,
+    PDF_RETRY_AFTER,
+    PDF_WORKERS,
+    TEMPLATES_DIRECTORY,
+)
+from backend.instrumentation import instrumentation
+from schemas.metrics import PdfRendererStats
+
+# Jinja environment of the worker process, created once by _init_worker
+_environment = None
+
+
+def _init_worker(templates_directory: str) -> None:
+    global _environment
+
+    from jinja2 import Environment, FileSystemLoader
+    import weasyprint  # noqa: F401 - imported here so the first job does not pay for it
+
+    _environment = Environment(loader=FileSystemLoader(templates_directory), autoescape=True)
+
+
+def _ping() -> None:
+    return None
+
+
+def _render(template_name: str, context: dict[str, Any]) -> tuple[bytes, float]:
+    from weasyprint import HTML
+
+    started = time.perf_counter()
+    html = _environment.get_template(template_name).render(**context)
+    pdf = HTML(string=html).write_pdf()
+    return pdf, time.perf_counter() - started
+
+
+class PdfRenderer:
+    """Renders Jinja templates to PDF in a pool of warmed worker processes.
+
+    At most ``workers + queue_size`` jobs are accepted at once, the rest are
+    rejected with 503 so the event loop never piles up unbounded work.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, retry_after: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._rendered = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._failed = 0
+        self._render_seconds_total = 0.0
+        self._render_seconds_max = 0.0
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(TEMPLATES_DIRECTORY,),
+        )
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        self._executor = self._create_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)))
+
+    def stop(self) -> None:
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _reject(self, status_code: int, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    async def render(self, template_name: str, context: dict[str, Any]) -> bytes:
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+        if self._pending >= self.workers + self.queue_size:
+            self._rejected += 1
+            raise self._reject(status.HTTP_503_SERVICE_UNAVAILABLE, "PDF renderer is busy")
+
+        loop = asyncio.get_running_loop()
+        job = self._executor.submit(_render, template_name, context)
+        # the slot is held until the worker is done with the job: a timed out
+        # render keeps running in its process and still occupies a worker
+        self._pending += 1
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            pdf, render_seconds = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout)
+        except TimeoutError:
+            self._timed_out += 1
+            raise self._reject(status.HTTP_504_GATEWAY_TIMEOUT, "PDF rendering timed out") from None
+        except BrokenProcessPool:
+            self._failed += 1
+            self.stop()
+            raise self._reject(status.HTTP_503_SERVICE_UNAVAILABLE, "PDF renderer restarted") from None
+
+        instrumentation.record("weasyprint", render_seconds)
+        self._rendered += 1
+        self._render_seconds_total += render_seconds
+        self._render_seconds_max = max(self._render_seconds_max, render_seconds)
+        return pdf
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def stats(self) -> PdfRendererStats:
+        return PdfRendererStats(
+            workers=self.workers,
+            queue_size=self.queue_size,
+            in_flight=self._pending,
+            queue_depth=max(self._pending - self.workers, 0),
+            rendered=self._rendered,
+            rejected=self._rejected,
+            timed_out=self._timed_out,
+            failed=self._failed,
+            render_seconds_total=self._render_seconds_total,
+            render_seconds_max=self._render_seconds_max,
+        )
+
+
+pdf_renderer = PdfRenderer(
+    workers=PDF_WORKERS,
+    queue_size=PDF_QUEUE_SIZE,
+    timeout=PDF_RENDER_TIMEOUT,
+    retry_after=PDF_RETRY_AFTER,
+)
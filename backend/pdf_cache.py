@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from backend.config import PDF_CACHE_DIRECTORY, PDF_CACHE_DISK_BYTES, PDF_CACHE_SIZE
+from schemas.metrics import PdfCacheStats
+
+
+class PdfCache:
+    """Content-addressed cache of rendered PDFs.
+
+    Keys are a hash of the template name and the render context of an order,
+    so any change of the order produces a new key. Entries are additionally
+    grouped by order id to drop stale documents as soon as the order changes.
+    The memory tier is a per-process LRU, the optional disk tier is shared by
+    all workers and capped by total size.
+    """
+
+    def __init__(self, size: int, directory: str | None, disk_bytes: int):
+        self.size = size
+        self.directory = Path(directory) if directory else None
+        self.disk_bytes = disk_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._order_keys: dict[int, set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(order_id: int, template_name: str, context: dict[str, Any]) -> str:
+        payload = json.dumps([template_name, context], sort_keys=True, default=str, ensure_ascii=False)
+        return f"{order_id}_{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    @staticmethod
+    def _order_id(key: str) -> int:
+        return int(key.split("_", 1)[0])
+
+    def _remember(self, key: str, pdf: bytes) -> None:
+        if self.size <= 0:
+            return
+        self._memory[key] = pdf
+        self._memory.move_to_end(key)
+        self._order_keys.setdefault(self._order_id(key), set()).add(key)
+
+        while len(self._memory) > self.size:
+            evicted, _ = self._memory.popitem(last=False)
+            keys = self._order_keys.get(self._order_id(evicted))
+            if keys is not None:
+                keys.discard(evicted)
+                if not keys:
+                    del self._order_keys[self._order_id(evicted)]
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self.directory / f"{key}.pdf"
+        try:
+            pdf = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return pdf
+
+    def _write_disk(self, key: str, pdf: bytes) -> None:
+        for stale in self.directory.glob(f"{self._order_id(key)}_*.pdf"):
+            stale.unlink(missing_ok=True)
+
+        temporary = self.directory / f"{key}.{os.getpid()}.tmp"
+        temporary.write_bytes(pdf)
+        temporary.replace(self.directory / f"{key}.pdf")
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        files = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _invalidate_disk(self, order_id: int) -> None:
+        for path in self.directory.glob(f"{order_id}_*.pdf"):
+            path.unlink(missing_ok=True)
+
+    async def get(self, key: str) -> bytes | None:
+        pdf = self._memory.get(key)
+        if pdf is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return pdf
+
+        if self.directory is not None:
+            pdf = await asyncio.to_thread(self._read_disk, key)
+            if pdf is not None:
+                self._remember(key, pdf)
+                self.hits += 1
+                return pdf
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, pdf: bytes) -> None:
+        self._invalidate_memory(self._order_id(key))
+        self._remember(key, pdf)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write_disk, key, pdf)
+
+    def _invalidate_memory(self, order_id: int) -> None:
+        for key in self._order_keys.pop(order_id, set()):
+            self._memory.pop(key, None)
+
+    async def invalidate(self, order_id: int) -> None:
+        self._invalidate_memory(order_id)
+        if self.directory is not None:
+            await asyncio.to_thread(self._invalidate_disk, order_id)
+
+    def stats(self) -> PdfCacheStats:
+        return PdfCacheStats(
+            size=self.size,
+            entries=len(self._memory),
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+
+pdf_cache = PdfCache(
+    size=PDF_CACHE_SIZE,
+    directory=PDF_CACHE_DIRECTORY,
+    disk_bytes=PDF_CACHE_DISK_BYTES,
+)
@@ -0,0 +1,153 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+from typing import AsyncGenerator
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import DATABASE_REPLICA_URLS, REPLICA_HEALTH_INTERVAL, REPLICA_MAX_LAG, REPLICA_STICKINESS
+from backend.session import AppSession, create_pooled_engine, session_factory
+
+logger = logging.getLogger(__name__)
+
+# Requests sent before this unix time (cookie value) read from the primary
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# Per-request flag raised when a session commits, see ReadYourWritesMiddleware
+_write_marker: contextvars.ContextVar[dict | None] = contextvars.ContextVar("write_marker", default=None)
+
+
+class ReplicaRouter:
+    """Round-robin over the replicas that passed the last health check.
+
+    A replica is healthy when it answers and its replay lag is below
+    ``max_lag`` seconds; a primary used as its own replica reports no lag.
+    A replica that has replayed all the WAL it received has no lag either:
+    the time since the last replayed commit only counts while replay is
+    behind, otherwise a primary without writes would fail every replica.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], interval: float, max_lag: float):
+        self.engines = engines
+        self.interval = interval
+        self.max_lag = max_lag
+        self.healthy: list[AsyncEngine] = list(engines)
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def choose(self) -> AsyncEngine | None:
+        healthy = self.healthy
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def _is_healthy(self, engine: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.interval), engine.connect() as connection:
+                result = await connection.execute(
+                    text(
+                        "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+                        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                        "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END"
+                    )
+                )
+                lag = result.scalar()
+        except Exception:
+            logger.warning("Replica %s is unreachable", engine.url.render_as_string(hide_password=True))
+            return False
+        # NULL lag means the replica has not replayed anything yet
+        return lag is not None and lag <= self.max_lag
+
+    async def check(self) -> None:
+        results = await asyncio.gather(*(self._is_healthy(engine) for engine in self.engines))
+        self.healthy = [engine for engine, healthy in zip(self.engines, results) if healthy]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def start(self) -> None:
+        if not self.engines or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_router = ReplicaRouter(
+    engines=[create_pooled_engine(url) for url in DATABASE_REPLICA_URLS],
+    interval=REPLICA_HEALTH_INTERVAL,
+    max_lag=REPLICA_MAX_LAG,
+)
+
+
+@event.listens_for(AppSession, "after_commit")
+def _mark_write(_: AppSession) -> None:
+    marker = _write_marker.get()
+    if marker is not None:
+        marker["written"] = True
+
+
+class ReadYourWritesMiddleware:
+    """Pins the client to the primary for a while after a request that committed.
+
+    The pin is a cookie, so it holds across workers. Only commits made before
+    the response starts are seen, which covers every non-streaming endpoint.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not replica_router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        marker = {"written": False}
+        token = _write_marker.set(marker)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker["written"]:
+                until = int(time.time()) + REPLICA_STICKINESS
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until}; Max-Age={REPLICA_STICKINESS}; Path=/; SameSite=lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _write_marker.reset(token)
+
+
+def read_session(request: Request) -> AsyncSession:
+    """Session for read-only work: a healthy replica, or the primary right after the client wrote."""
+    try:
+        read_primary = int(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        read_primary = False
+
+    replica = None if read_primary else replica_router.choose()
+    if replica is None:
+        return session_factory()
+    return session_factory(bind=replica)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with read_session(request) as session:
+        yield session
@@ -0,0 +1,81 @@
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from backend.config import FAST_JSON_RESPONSES
+
+# Name of the Response parameter added to endpoints that do not declare one
+_RESPONSE_PARAMETER = "fast_json_response"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by pydantic's native serializer.
+
+    Models are dumped with their aliases, so the camelCase field names are the
+    same as with the default encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content, by_alias=True)
+
+
+class FastJSONRoute(APIRoute):
+    """Route that encodes the returned model directly, without re-validating it.
+
+    FastAPI validates the value an endpoint returns against ``response_model``
+    and only then encodes it. When the endpoint already returns an instance of
+    exactly that model the validation produces the same object, so this route
+    skips it and renders the model with ``FastJSONResponse``. Any other return
+    value goes through the regular pipeline. Status code, headers and cookies
+    set on the injected ``Response`` are kept.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        self._fast_json_model: type | None = None
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
+        if isinstance(self.response_model, type):
+            self._fast_json_model = self.response_model
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any], status_code: int | None) -> Callable[..., Any]:
+        signature = inspect.signature(endpoint, eval_str=True)
+        response_parameter = next(
+            (name for name, parameter in signature.parameters.items() if parameter.annotation is Response),
+            None,
+        )
+        if response_parameter is None:
+            signature = signature.replace(
+                parameters=[
+                    *signature.parameters.values(),
+                    inspect.Parameter(_RESPONSE_PARAMETER, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+                ]
+            )
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs: Any) -> Any:
+            if response_parameter is None:
+                response = kwargs.pop(_RESPONSE_PARAMETER)
+            else:
+                response = kwargs[response_parameter]
+
+            content = await endpoint(**kwargs)
+            if self._fast_json_model is None or type(content) is not self._fast_json_model:
+                return content
+
+            fast_response = FastJSONResponse(content, status_code=response.status_code or status_code or 200)
+            fast_response.headers.raw.extend(response.headers.raw)
+            return fast_response
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+
+# Route class of the application routers, FAST_JSON_RESPONSES switches all of them at once
+DefaultRoute = FastJSONRoute if FAST_JSON_RESPONSES else APIRoute
@@ -1,14 +1,104 @@
+import time
 from typing import AsyncGenerator
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from backend.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_PREPARED_STATEMENT_CACHE_SIZE,
+    DB_STATEMENT_CACHE_SIZE,
+    PG_DATABASE,
+    PG_HOST,
+    PG_PASSWORD,
+    PG_LOGIN,
+    PG_PORT,
+)
+from backend.instrumentation import instrumentation
+from schemas.metrics import DbPoolStats
+
+
+def build_database_url(database: str | None) -> str:
+    host = f"{PG_HOST}:{PG_PORT}" if PG_PORT else PG_HOST
+    return f"postgresql+asyncpg://{PG_LOGIN}:{PG_PASSWORD}@{host}/{database}"
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> DbPoolStats:
+        return DbPoolStats(
+            size=self.size(),
+            checked_in=self.checkedin(),
+            checked_out=self.checkedout(),
+            overflow=self.overflow(),
+            max_overflow=self._max_overflow,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_seconds_total=self.wait_seconds_total,
+            wait_seconds_max=self.wait_seconds_max,
+        )
+
+
+def create_pooled_engine(
+    url: str,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
+    instrumentation.instrument_engine(engine.sync_engine)
+    return engine
+
+
+class AppSession(Session):
+    """Sync session class behind every AsyncSession of the app, a target for session events."""
 
-from backend.config import PG_DATABASE, PG_HOST, PG_PASSWORD, PG_LOGIN
 
-DATABASE_URL = f"postgresql+asyncpg://{PG_LOGIN}:{PG_PASSWORD}@{PG_HOST}/{PG_DATABASE}"
-engine = create_async_engine(DATABASE_URL)
+DATABASE_URL = build_database_url(PG_DATABASE)
+engine = create_pooled_engine(DATABASE_URL)
 session_factory = async_sessionmaker(
     engine,
+    sync_session_class=AppSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -21,7 +111,7 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db():
-    creation_url = f"postgresql+asyncpg://{PG_LOGIN}:{PG_PASSWORD}@{PG_HOST}/postgres"
+    creation_url = build_database_url("postgres")
     creation_engine = create_async_engine(creation_url, future=True)
     async with creation_engine.connect() as connection:
         await connection.execute(text("COMMIT"))
@@ -0,0 +1,235 @@
+"""Synthetic dataset generator for benchmarks and load tests.
+
+Loads users, products, product orders and sales requests with ``COPY``, then
+fills the materialized order totals and the daily sales rollups the way the
+application would have. Ids continue after the existing rows, so the script
+may be run repeatedly; ``--truncate`` empties the tables first. The same
+``--seed`` produces the same data::
+
+    python -m benchmarks.generate --users 1000 --products 100000 --orders 200000 --sales 1000000
+
+Every generated user is called ``bench_<n>`` and has the password given by
+``--password``; every tenth one (``bench_1``, ``bench_11``, ...) has all
+permissions, the others may only sell.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, text, update
+
+import models
+from backend.passwords import password_hasher
+from backend.session import engine, session_factory
+from benchmarks.stats import report
+from schemas.reports import RollupRange
+from schemas.security import Permission
+from services import ReportsService
+
+ALL_PERMISSIONS = Permission.MANAGE_USERS | Permission.MANAGE_PRODUCTS | Permission.SELL_PRODUCTS
+# Share of sales requests that are attached to an order, the rest stay open
+ATTACHED_SHARE = 0.8
+FINISHED_SHARE = 0.7
+HISTORY_DAYS = 365
+
+WORDS = (
+    "яблоки груши молоко хлеб сыр масло чай кофе сахар соль рис гречка мука "
+    "печенье сок вода шоколад мед орехи рыба курица макароны крупа перец"
+).split()
+
+
+def generate_users(rng: random.Random, first_id: int, count: int, password_hash: str) -> Iterator[tuple]:
+    for index in range(count):
+        number = first_id + index
+        permission = ALL_PERMISSIONS if number % 10 == 1 else Permission.SELL_PRODUCTS
+        yield number, f"bench_{number}", int(permission), password_hash
+
+
+def generate_products(rng: random.Random, first_id: int, count: int) -> Iterator[tuple]:
+    for index in range(count):
+        product_id = first_id + index
+        name = " ".join(rng.choices(WORDS, k=3)).capitalize()
+        description = " ".join(rng.choices(WORDS, k=12))
+        yield product_id, name, f"BENCH-{product_id:09d}", description, round(rng.uniform(10, 5000), 2), 1_000_000
+
+
+def generate_orders(rng: random.Random, first_id: int, count: int, user_ids: range) -> Iterator[tuple]:
+    now = datetime.now()
+    for index in range(count):
+        realization_date = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 24 * 3600))
+        yield first_id + index, rng.random() < FINISHED_SHARE, rng.choice(user_ids), realization_date
+
+
+def generate_sales(
+    rng: random.Random,
+    first_id: int,
+    count: int,
+    product_ids: range,
+    orders: list[tuple[int, int]],
+    user_ids: range,
+) -> Iterator[tuple]:
+    for index in range(count):
+        if orders and rng.random() < ATTACHED_SHARE:
+            order_id, user_id = rng.choice(orders)
+        else:
+            order_id, user_id = None, rng.choice(user_ids)
+        price = round(rng.uniform(10, 5000), 2)
+        yield (
+            first_id + index,
+            user_id,
+            rng.choice(product_ids),
+            price,
+            round(price * 0.1, 2),
+            rng.randint(1, 10),
+            order_id,
+        )
+
+
+def order_totals_update(first_order: int):
+    """Set-based variant of ProductsService.order_totals_update for all new orders at once."""
+    sales = models.SalesRequests
+    orders = models.ProductOrder
+    totals = (
+        select(
+            sales.product_order_id,
+            func.sum(sales.price * sales.quantity).label("total_price"),
+            func.sum(sales.income * sales.quantity).label("total_income"),
+            func.count().label("items_count"),
+        )
+        .where(sales.product_order_id >= first_order)
+        .group_by(sales.product_order_id)
+        .subquery()
+    )
+    return (
+        update(orders)
+        .where(orders.id == totals.c.product_order_id)
+        .values(
+            total_price=totals.c.total_price,
+            total_income=totals.c.total_income,
+            items_count=totals.c.items_count,
+        )
+    )
+
+
+async def next_id(connection, model) -> int:
+    return (await connection.scalar(select(func.coalesce(func.max(model.id), 0)))) + 1
+
+
+async def copy(connection, model, columns: list[str], records: Iterator[tuple]) -> float:
+    started = time.perf_counter()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(model.__tablename__, records=records, columns=columns)
+    return time.perf_counter() - started
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    password_hash = await password_hasher.hash(args.password)
+    timings: dict[str, float] = {}
+
+    async with engine.begin() as connection:
+        if args.truncate:
+            tables = ", ".join(
+                model.__tablename__
+                for model in (
+                    models.SalesDailyRollup,
+                    models.SalesRequests,
+                    models.ProductOrder,
+                    models.Product,
+                    models.User,
+                )
+            )
+            await connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+
+        first_user = await next_id(connection, models.User)
+        first_product = await next_id(connection, models.Product)
+        first_order = await next_id(connection, models.ProductOrder)
+        first_sale = await next_id(connection, models.SalesRequests)
+        user_ids = range(first_user, first_user + args.users)
+        product_ids = range(first_product, first_product + args.products)
+
+        timings["users"] = await copy(
+            connection,
+            models.User,
+            ["id", "username", "permission", "password_hash"],
+            generate_users(rng, first_user, args.users, password_hash),
+        )
+        timings["products"] = await copy(
+            connection,
+            models.Product,
+            ["id", "name", "article", "description", "price", "quantity"],
+            generate_products(rng, first_product, args.products),
+        )
+
+        orders = list(generate_orders(rng, first_order, args.orders, user_ids))
+        timings["product_orders"] = await copy(
+            connection,
+            models.ProductOrder,
+            ["id", "finished", "user_id", "realization_date"],
+            iter(orders),
+        )
+        timings["sales_requests"] = await copy(
+            connection,
+            models.SalesRequests,
+            ["id", "user_id", "product_id", "price", "income", "quantity", "product_order_id"],
+            generate_sales(
+                rng,
+                first_sale,
+                args.sales,
+                product_ids,
+                [(order_id, user_id) for order_id, _, user_id, _ in orders],
+                user_ids,
+            ),
+        )
+
+        for model in (models.User, models.Product, models.ProductOrder, models.SalesRequests):
+            table = model.__tablename__
+            await connection.execute(
+                text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))")
+            )
+
+        started = time.perf_counter()
+        await connection.execute(order_totals_update(first_order))
+        timings["order_totals"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async with session_factory() as session:
+        await ReportsService(session).rebuild_rollups(
+            RollupRange(date_from=date.today() - timedelta(days=HISTORY_DAYS + 1), date_to=date.today())
+        )
+    timings["rollups"] = time.perf_counter() - started
+
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        started = time.perf_counter()
+        await connection.execute(text("ANALYZE"))
+        timings["analyze"] = time.perf_counter() - started
+
+    report(
+        {
+            "name": "generate",
+            "users": args.users,
+            "products": args.products,
+            "orders": args.orders,
+            "sales": args.sales,
+            "seconds": {name: round(seconds, 3) for name, seconds in timings.items()},
+        }
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--sales", type=int, default=500_000)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,124 @@
+"""Mixed seller load scenario against a running API.
+
+Each of ``--sellers`` virtual users logs in once and then repeats the sales
+workflow ``--iterations`` times: browse /products/list, file ``--basket``
+sales requests, read /products/sales-list, turn the new requests into an
+order, list the orders and fetch the order PDF. Prints one JSON line per
+endpoint and one for the whole run.
+
+The users are ``bench_<n>`` accounts made by ``benchmarks.generate``; filing
+sales requests needs the product management permission, so the scenario
+uses every tenth account starting at ``--first-user`` (``bench_1``,
+``bench_11``, ...)::
+
+    python -m benchmarks.load --url http://localhost:8000/api --sellers 20 --iterations 50
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import httpx
+from jose import jwt
+
+from benchmarks.stats import report, summarize
+from schemas.security import TokenDataSchema
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.is_error or (
+            response.headers.get("content-type") == "application/json" and response.json().get("ok") is False
+        ):
+            self.errors[name] += 1
+        return response
+
+
+async def seller(
+    url: str, username: str, password: str, iterations: int, basket: int, recorder: Recorder, rng: random.Random
+) -> None:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        response = await recorder.call(
+            client, "login", "POST", "/user/login", json={"username": username, "password": password}
+        )
+        response.raise_for_status()
+        # the login response has no user id, the token is read without checking the signature
+        claims = jwt.get_unverified_claims(client.cookies["access_token"])
+        user_id = TokenDataSchema.deserialize(claims).user_id
+        pagination = {"page": 1, "perPage": 50}
+
+        for _ in range(iterations):
+            response = await recorder.call(
+                client, "products_list", "POST", "/products/list", json={"pagination": pagination}
+            )
+            products = [product for product in response.json()["products"] if product["quantity"] > basket]
+            if not products:
+                continue
+
+            for product in rng.sample(products, min(basket, len(products))):
+                await recorder.call(
+                    client,
+                    "create_sales_request",
+                    "POST",
+                    "/products/create-sales-request",
+                    json={
+                        "article": product["article"],
+                        "quantity": 1,
+                        "price": product["price"],
+                        "userId": user_id,
+                        "income": round(product["price"] * 0.1, 2),
+                    },
+                )
+
+            sales_filter = {"pagination": {"page": 1, "perPage": basket}}
+            response = await recorder.call(client, "sales_list", "POST", "/products/sales-list", json=sales_filter)
+            ids = [item["id"] for item in response.json()["items"]]
+
+            response = await recorder.call(client, "create_order", "POST", "/products/create-order", json={"ids": ids})
+            order_id = response.json().get("orderId")
+
+            await recorder.call(
+                client, "list_product_orders", "POST", "/products/list-product-orders", json={"pagination": pagination}
+            )
+            if order_id is not None:
+                await recorder.call(client, "get_order_pdf", "POST", "/products/get-order-pdf", json={"id": order_id})
+
+
+async def main(args: argparse.Namespace) -> None:
+    recorder = Recorder()
+    usernames = [f"bench_{args.first_user + 10 * index}" for index in range(args.sellers)]
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            seller(args.url, username, args.password, args.iterations, args.basket, recorder, random.Random(index))
+            for index, username in enumerate(usernames)
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    for name, latencies in recorder.latencies.items():
+        report(summarize(name, latencies, elapsed, recorder.errors[name]))
+    all_latencies = [latency for latencies in recorder.latencies.values() for latency in latencies]
+    report(summarize(f"total@{args.sellers}", all_latencies, elapsed, sum(recorder.errors.values())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api")
+    parser.add_argument("--sellers", type=int, default=10)
+    parser.add_argument("--first-user", type=int, default=1)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--basket", type=int, default=3, help="sales requests per order")
+    args = parser.parse_args()
+    asyncio.run(main(args))
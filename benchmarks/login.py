@@ -0,0 +1,52 @@
+"""Login load test against a running API.
+
+Fires ``--requests`` logins with ``--concurrency`` of them in flight and
+reports latency percentiles. With bcrypt running on the event loop p99 grows
+with concurrency times the hash cost; with the hashing pool it is bounded by
+the pool size::
+
+    python -m benchmarks.login --url http://localhost:8000/api --username admin --password secret
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.stats import report, summarize
+
+
+async def main(url: str, username: str, password: str, requests: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+
+        async def login() -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/user/login", json={"username": username, "password": password})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    report(summarize(f"login@{concurrency}", latencies, elapsed, errors))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+    for concurrency in args.concurrency:
+        asyncio.run(main(args.url, args.username, args.password, args.requests, concurrency))
@@ -0,0 +1,117 @@
+"""Query plan check for the seller and order hot paths.
+
+EXPLAINs the statements behind /products/sales-list, /products/list-product-orders,
+/user/employees and the per-order requests and rollup queries on data made
+by ``benchmarks.generate``. Exits with status 1 if any of them reads
+``sales_requests``, ``product_orders`` or ``users`` with a sequential scan or
+does not use the index meant for it.
+
+Sequential scans are disabled for the session by default, so the planner
+only falls back to one when no index can serve the query; that makes the
+check independent of the dataset size. ``--planner-defaults`` keeps the
+normal cost settings to see the plans production would get::
+
+    python -m benchmarks.plans
+    python -m benchmarks.plans --planner-defaults
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import select, text
+
+import models
+from backend.explain import Explain, parse_plan
+from backend.session import engine, session_factory
+from benchmarks.services import load_context
+from benchmarks.stats import report
+from schemas.base import PaginationRequest
+from services import ProductsService, ReportsService, SecurityService
+
+CHECKED_TABLES = (
+    models.SalesRequests.__tablename__,
+    models.ProductOrder.__tablename__,
+    models.User.__tablename__,
+)
+
+
+def statements(context, per_page: int) -> dict[str, tuple[Any, str]]:
+    """Statements to check and the index each of them is expected to use."""
+    service = ProductsService(session=None)
+    pagination = PaginationRequest(page=1, per_page=per_page)
+
+    def orders_page(principal):
+        return service.apply_pagination(service.product_orders_stmt("", principal), pagination, models.ProductOrder.id)
+
+    return {
+        "sales_list": (
+            service.apply_pagination(service.sales_requests_stmt("", context.seller), pagination),
+            "ix_sales_requests_open_user_id",
+        ),
+        "orders_list_seller": (orders_page(context.seller), "ix_product_orders_user_id_id"),
+        "orders_list_admin": (orders_page(context.admin), "product_orders_pkey"),
+        # the order PDF and the order totals select the requests of one order
+        "order_requests": (
+            select(models.SalesRequests).where(models.SalesRequests.product_order_id == context.order_id),
+            "ix_sales_requests_product_order_id",
+        ),
+        "order_rollup": (
+            ReportsService.rollup_totals(models.ProductOrder.id == context.order_id),
+            "ix_sales_requests_product_order_id",
+        ),
+        "employees_list": (
+            service.apply_pagination(SecurityService(session=None).employees_stmt(""), pagination),
+            "ix_users_permission_sell_products",
+        ),
+    }
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+async def main(args: argparse.Namespace) -> None:
+    context = await load_context(password="")
+    failed = False
+    async with session_factory() as session:
+        if not args.planner_defaults:
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, (stmt, expected_index) in statements(context, args.per_page).items():
+            plan = parse_plan((await session.execute(Explain(stmt))).scalar())
+            nodes = list(plan_nodes(plan))
+            seq_scans = sorted(
+                {
+                    node["Relation Name"]
+                    for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES
+                }
+            )
+            indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+            ok = not seq_scans and expected_index in indexes
+            failed = failed or not ok
+            report(
+                {
+                    "name": name,
+                    "ok": ok,
+                    "expected_index": expected_index,
+                    "indexes": indexes,
+                    "seq_scans": seq_scans,
+                    "total_cost": plan["Total Cost"],
+                }
+            )
+        await session.rollback()
+    await engine.dispose()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--planner-defaults", action="store_true", help="do not disable sequential scans")
+    args = parser.parse_args()
+    asyncio.run(main(args))
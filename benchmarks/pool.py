@@ -0,0 +1,75 @@
+"""Connection pool sizing scenario.
+
+Each simulated request checks out a connection, runs a query taking
+``--query-ms`` and spends ``--work-ms`` outside the database, the same shape
+as a typical endpoint. The scenario is repeated for every pool size to show
+where latency stops improving (pool large enough) and where pool waits and
+timeouts start (pool too small for the concurrency)::
+
+    python -m benchmarks.pool --concurrency 100 --pool-sizes 5 10 20 40
+
+Remember that every gunicorn worker has its own pool: workers x (pool size +
+max overflow) must stay below the server's max_connections.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from backend.session import DATABASE_URL, create_pooled_engine
+from benchmarks.stats import report, summarize
+
+
+async def run(pool_size: int, args: argparse.Namespace) -> None:
+    engine = create_pooled_engine(DATABASE_URL, pool_size=pool_size, max_overflow=0, pool_timeout=args.pool_timeout)
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def request() -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": args.query_ms / 1000})
+                await asyncio.sleep(args.work_ms / 1000)
+            except PoolTimeoutError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    pool_stats = engine.pool.stats()
+    await engine.dispose()
+
+    result = summarize(f"pool_size={pool_size}", latencies, elapsed, errors)
+    result.update(
+        concurrency=args.concurrency,
+        pool_size=pool_size,
+        pool_wait_mean_ms=round(pool_stats.wait_seconds_total / max(pool_stats.checkouts, 1) * 1000, 3),
+        pool_wait_max_ms=round(pool_stats.wait_seconds_max * 1000, 3),
+        pool_timeouts=pool_stats.timeouts,
+    )
+    report(result)
+
+
+async def main(args: argparse.Namespace) -> None:
+    for pool_size in args.pool_sizes:
+        await run(pool_size, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--query-ms", type=float, default=5)
+    parser.add_argument("--work-ms", type=float, default=5)
+    parser.add_argument("--pool-timeout", type=float, default=5)
+    asyncio.run(main(parser.parse_args()))
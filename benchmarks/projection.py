@@ -0,0 +1,152 @@
+"""ORM hydration versus column projection for list endpoints.
+
+Fetches the same page of products, users and sales requests ``--repeat`` times,
+once by loading ORM entities and copying them into schemas field by field (the
+previous code) and once with a column select validated in bulk through a
+``TypeAdapter`` (``BaseService.project``). Reports per-page latency and the
+peak memory allocated while building one page::
+
+    python -m benchmarks.projection --per-page 50 100 500 --repeat 200
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import joinedload
+
+import models
+import schemas.products as products_schemas
+import schemas.security as security_schemas
+from backend.session import engine, session_factory
+from benchmarks.stats import report, summarize
+from services.base import BaseService
+from services.products import PRODUCT_ITEM_COLUMNS, PRODUCT_ITEMS, SALES_ITEMS
+from services.security import USER_ITEMS
+
+
+async def products_orm(session, per_page: int) -> list:
+    result = await session.execute(select(models.Product).order_by(models.Product.id.desc()).limit(per_page))
+    return [
+        products_schemas.ProductItem(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            price=row.price,
+            article=row.article,
+            quantity=row.quantity,
+        )
+        for row in result.scalars().all()
+    ]
+
+
+async def products_projection(session, per_page: int) -> list:
+    result = await session.execute(select(*PRODUCT_ITEM_COLUMNS).order_by(models.Product.id.desc()).limit(per_page))
+    return BaseService.project(PRODUCT_ITEMS, result.all())
+
+
+async def users_orm(session, per_page: int) -> list:
+    result = await session.execute(select(models.User).order_by(models.User.id.desc()).limit(per_page))
+    return [
+        security_schemas.UserDataRequest(username=row.username, password="", permission=row.permission)
+        for row in result.scalars().all()
+    ]
+
+
+async def users_projection(session, per_page: int) -> list:
+    stmt = select(
+        models.User.id,
+        models.User.username,
+        literal("").label("password"),
+        models.User.permission,
+    ).order_by(models.User.id.desc())
+    result = await session.execute(stmt.limit(per_page))
+    return BaseService.project(USER_ITEMS, result.all())
+
+
+async def sales_orm(session, per_page: int) -> list:
+    stmt = (
+        select(models.SalesRequests)
+        .options(joinedload(models.SalesRequests.product))
+        .order_by(models.SalesRequests.id.desc())
+        .limit(per_page)
+    )
+    result = await session.execute(stmt)
+    return [
+        products_schemas.SalesItem(
+            id=row.id,
+            income=row.income,
+            product_name=row.product.name,
+            quantity=row.quantity,
+            price=row.price,
+        )
+        for row in result.scalars().all()
+    ]
+
+
+async def sales_projection(session, per_page: int) -> list:
+    stmt = (
+        select(
+            models.SalesRequests.id,
+            models.Product.name.label("product_name"),
+            models.SalesRequests.price,
+            models.SalesRequests.quantity,
+            models.SalesRequests.income,
+        )
+        .join(models.Product, models.SalesRequests.product_id == models.Product.id)
+        .order_by(models.SalesRequests.id.desc())
+        .limit(per_page)
+    )
+    result = await session.execute(stmt)
+    return BaseService.project(SALES_ITEMS, result.all())
+
+
+SCENARIOS = {
+    "products": (products_orm, products_projection),
+    "users": (users_orm, users_projection),
+    "sales": (sales_orm, sales_projection),
+}
+
+
+async def run(name: str, fetch, per_page: int, repeat: int) -> dict:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        # a fresh session per page, as a request would get
+        async with session_factory() as session:
+            page_started = time.perf_counter()
+            await fetch(session, per_page)
+            latencies.append(time.perf_counter() - page_started)
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        await fetch(session, per_page)
+        tracemalloc.start()
+        await fetch(session, per_page)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = summarize(name, latencies, elapsed)
+    result["per_page"] = per_page
+    result["peak_alloc_kib"] = round(peak / 1024, 1)
+    return result
+
+
+async def main(scenarios: list[str], sizes: list[int], repeat: int) -> None:
+    for scenario in scenarios:
+        orm, projection = SCENARIOS[scenario]
+        for per_page in sizes:
+            report(await run(f"{scenario}_orm", orm, per_page, repeat))
+            report(await run(f"{scenario}_projection", projection, per_page, repeat))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--per-page", nargs="+", type=int, default=[50, 100, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.scenarios, args.per_page, args.repeat))
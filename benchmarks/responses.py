@@ -0,0 +1,128 @@
+"""Response encoding benchmark for /products/list.
+
+``serialize`` times the encoding of an in-memory ``ProductList`` page: the
+default pipeline (re-validation against the response model, ``jsonable_encoder``
+and the stdlib ``json``) against ``FastJSONResponse``. ``http`` calls
+/products/list in-process through the ASGI app, once with
+FAST_JSON_RESPONSES=false and once with it enabled, each in its own process
+because the route class is picked when the routers are imported::
+
+    python -m benchmarks.responses serialize --per-page 50 200 1000
+    python -m benchmarks.responses http --per-page 50 200 --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+import schemas.products as products_schemas
+from backend.responses import FastJSONResponse
+from benchmarks.stats import report, summarize
+from schemas.base import PaginationResponse
+
+
+def product_page(per_page: int) -> products_schemas.ProductList:
+    return products_schemas.ProductList(
+        products=[
+            products_schemas.ProductItem(
+                id=index,
+                name=f"Товар {index}",
+                description="Описание товара " * 4,
+                price=index + 0.99,
+                article=f"ART-{index:08d}",
+                quantity=index % 100,
+            )
+            for index in range(per_page)
+        ],
+        pagination_info=PaginationResponse(row_count=per_page * 10),
+    )
+
+
+def serialize(sizes: list[int], repeat: int) -> None:
+    adapter = TypeAdapter(products_schemas.ProductList)
+
+    def default(page: products_schemas.ProductList) -> bytes:
+        validated = adapter.validate_python(page)
+        return JSONResponse(jsonable_encoder(validated, by_alias=True)).body
+
+    def fast(page: products_schemas.ProductList) -> bytes:
+        return FastJSONResponse(page).body
+
+    for per_page in sizes:
+        page = product_page(per_page)
+        # both paths must produce the same document
+        assert json.loads(default(page)) == json.loads(fast(page))
+        for name, encode in (("default", default), ("fast_json", fast)):
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(repeat):
+                encode_started = time.perf_counter()
+                encode(page)
+                latencies.append(time.perf_counter() - encode_started)
+            result = summarize(f"serialize_{name}", latencies, time.perf_counter() - started)
+            result["per_page"] = per_page
+            report(result)
+
+
+async def http_child(sizes: list[int], requests: int) -> None:
+    import httpx
+
+    import main
+    from backend.session import engine
+    from services import SecurityService
+
+    mode = "fast_json" if os.environ["FAST_JSON_RESPONSES"] == "true" else "default"
+    token = SecurityService.generate_jwt(7, 1)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", cookies={"access_token": token}
+    ) as client:
+        for per_page in sizes:
+            body = {"keyword": "", "pagination": {"page": 1, "perPage": per_page}}
+            await client.post("/products/list", json=body)
+            latencies = []
+            errors = 0
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_started = time.perf_counter()
+                response = await client.post("/products/list", json=body)
+                latencies.append(time.perf_counter() - request_started)
+                errors += response.status_code != 200
+            result = summarize(f"http_{mode}", latencies, time.perf_counter() - started, errors)
+            result["per_page"] = per_page
+            report(result)
+    await engine.dispose()
+
+
+def http(sizes: list[int], requests: int) -> None:
+    for enabled in ("false", "true"):
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.responses", "http-child", "--requests", str(requests), "--per-page"]
+            + [str(size) for size in sizes],
+            env={**os.environ, "FAST_JSON_RESPONSES": enabled},
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["serialize", "http", "http-child"])
+    parser.add_argument("--per-page", nargs="+", type=int, default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.mode == "serialize":
+        serialize(args.per_page, args.repeat)
+    elif args.mode == "http":
+        http(args.per_page, args.requests)
+    else:
+        asyncio.run(http_child(args.per_page, args.requests))
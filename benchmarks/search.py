@@ -0,0 +1,87 @@
+"""Keyword search benchmark over a synthetic copy of the products table.
+
+Creates ``bench_products`` with the same columns and indexes as ``products``,
+grows it to each requested size and times the keyword filter used by
+``ProductsService`` with and without the trigram indexes::
+
+    python -m benchmarks.search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import MetaData, select, text
+
+import models
+from backend.session import engine
+from services import search
+
+BENCH_TABLE = "bench_products"
+
+
+async def fill(connection, start: int, stop: int) -> None:
+    await connection.execute(
+        text(f"""
+            INSERT INTO {BENCH_TABLE} (name, article, description, price, quantity)
+            SELECT
+                'Товар ' || md5(g::text),
+                'ART-' || lpad(g::text, 8, '0'),
+                'Описание товара номер ' || g,
+                (g % 1000) + 0.99,
+                g % 100
+            FROM generate_series(:start, :stop - 1) AS g
+            """),
+        {"start": start, "stop": stop},
+    )
+    await connection.execute(text(f"ANALYZE {BENCH_TABLE}"))
+
+
+async def measure(connection, stmt, repeat: int, sequential: bool) -> float:
+    await connection.execute(text(f"SET LOCAL enable_bitmapscan = {'off' if sequential else 'on'}"))
+    await connection.execute(text(f"SET LOCAL enable_indexscan = {'off' if sequential else 'on'}"))
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await connection.execute(stmt)
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+async def main(sizes: list[int], keyword: str, repeat: int) -> None:
+    table = models.Product.__table__.to_metadata(MetaData(), name=BENCH_TABLE)
+    stmt = (
+        select(table.c.id, table.c.name, table.c.article)
+        .where(search.keyword_condition(keyword, table.c.name, table.c.article))
+        .order_by(table.c.id.desc())
+        .limit(50)
+    )
+
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP TABLE IF EXISTS {BENCH_TABLE}"))
+        await connection.execute(text(f"CREATE TABLE {BENCH_TABLE} (LIKE products INCLUDING ALL)"))
+
+    results = []
+    loaded = 0
+    for size in sorted(sizes):
+        async with engine.begin() as connection:
+            await fill(connection, loaded + 1, size + 1)
+            loaded = size
+            indexed_ms = await measure(connection, stmt, repeat, sequential=False)
+            sequential_ms = await measure(connection, stmt, repeat, sequential=True)
+        results.append({"rows": size, "indexed_ms": round(indexed_ms, 3), "sequential_ms": round(sequential_ms, 3)})
+        print(json.dumps(results[-1]), flush=True)
+
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP TABLE {BENCH_TABLE}"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--keyword", default="ART-0004")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.keyword, args.repeat))
@@ -0,0 +1,195 @@
+"""Micro-benchmarks of service methods against the configured database.
+
+Calls each ``ProductsService`` / ``SecurityService`` method ``--repeat``
+times in a fresh session, without HTTP, routing or serialization in the
+way, and reports latency percentiles per method. Run it on data made by
+``benchmarks.generate``; the seller is the ``bench_*`` user with the most
+open sales requests. The catalog and employee caches are off unless
+``--with-cache``::
+
+    python -m benchmarks.services --repeat 200 --cases products_list sales_list
+    python -m benchmarks.services --writes
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import func, select
+
+import models
+import schemas.products as products_schemas
+import schemas.security as security_schemas
+from backend.catalog_cache import catalog_cache
+from backend.session import engine, session_factory
+from benchmarks.generate import ALL_PERMISSIONS
+from benchmarks.stats import report, summarize
+from schemas.base import PaginationRequest
+from services import ProductsService, SecurityService
+from services.security import employee_cache
+
+
+class Context:
+    def __init__(self, seller: models.User, admin: models.User, article: str, order_id: int, password: str):
+        now = int(datetime.now().timestamp())
+        self.seller = security_schemas.TokenDataSchema(permission=seller.permission, iat=now, user_id=seller.id)
+        self.admin = security_schemas.TokenDataSchema(permission=admin.permission, iat=now, user_id=admin.id)
+        self.login = security_schemas.UserLogin(username=seller.username, password=password)
+        self.article = article
+        self.order_id = order_id
+
+
+def page(per_page: int) -> PaginationRequest:
+    return PaginationRequest(page=1, per_page=per_page)
+
+
+async def products_list(session, context: Context, per_page: int):
+    await ProductsService(session).get_products_list(products_schemas.ProductListFilter(pagination=page(per_page)))
+
+
+async def products_search(session, context: Context, per_page: int):
+    products_filter = products_schemas.ProductListFilter(keyword="молоко", pagination=page(per_page))
+    await ProductsService(session).get_products_list(products_filter)
+
+
+async def orders_list_seller(session, context: Context, per_page: int):
+    orders_request = products_schemas.ProductOrdersRequest(pagination=page(per_page))
+    await ProductsService(session).list_product_orders(orders_request, context.seller)
+
+
+async def orders_list_admin(session, context: Context, per_page: int):
+    orders_request = products_schemas.ProductOrdersRequest(pagination=page(per_page))
+    await ProductsService(session).list_product_orders(orders_request, context.admin)
+
+
+async def sales_list(session, context: Context, per_page: int):
+    sales_request_filter = products_schemas.SalesRequestFilter(pagination=page(per_page))
+    await ProductsService(session).get_sales_requests(sales_request_filter, context.seller)
+
+
+async def order_pdf_context(session, context: Context, per_page: int):
+    await ProductsService(session).get_order_pdf_context(context.order_id)
+
+
+async def users_list(session, context: Context, per_page: int):
+    await SecurityService(session).list_users(security_schemas.UserListFilter(pagination=page(per_page)))
+
+
+async def employees_list(session, context: Context, per_page: int):
+    await SecurityService(session).list_employees(security_schemas.EmployeeListFilter(per_page=per_page))
+
+
+async def login(session, context: Context, per_page: int):
+    await SecurityService(session).login_user(context.login, Response())
+
+
+async def create_sales_request(session, context: Context, per_page: int):
+    sales_request = products_schemas.SalesRequest(
+        article=context.article, quantity=1, price=100, user_id=context.seller.user_id, income=10
+    )
+    await ProductsService(session).create_sales_request(sales_request)
+
+
+async def create_order(session, context: Context, per_page: int):
+    service = ProductsService(session)
+    sales_request = products_schemas.SalesRequest(
+        article=context.article, quantity=1, price=100, user_id=context.seller.user_id, income=10
+    )
+    await service.create_sales_request(sales_request)
+    sales_request_id = await session.scalar(
+        select(func.max(models.SalesRequests.id)).where(models.SalesRequests.user_id == context.seller.user_id)
+    )
+    await service.create_product_order(
+        products_schemas.CreateProductOrderRequest(ids=[sales_request_id]), context.seller
+    )
+
+
+READ_CASES = {
+    "products_list": products_list,
+    "products_search": products_search,
+    "orders_list_seller": orders_list_seller,
+    "orders_list_admin": orders_list_admin,
+    "sales_list": sales_list,
+    "order_pdf_context": order_pdf_context,
+    "users_list": users_list,
+    "employees_list": employees_list,
+    "login": login,
+}
+# Write cases add rows, reserve stock and bump the catalog version
+WRITE_CASES = {
+    "create_sales_request": create_sales_request,
+    "create_order": create_order,
+}
+
+
+async def load_context(password: str) -> Context:
+    async with session_factory() as session:
+        seller_id = await session.scalar(
+            select(models.SalesRequests.user_id)
+            .join(models.User, models.SalesRequests.user_id == models.User.id)
+            .where(models.SalesRequests.product_order_id.is_(None), models.User.username.like("bench\\_%"))
+            .group_by(models.SalesRequests.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+        if seller_id is None:
+            raise SystemExit("No bench_* sellers with open sales requests, run benchmarks.generate first")
+        seller = await session.get(models.User, seller_id)
+        admin = await session.scalar(
+            select(models.User).where(models.User.permission == ALL_PERMISSIONS).order_by(models.User.id).limit(1)
+        )
+        article = await session.scalar(select(models.Product.article).order_by(models.Product.quantity.desc()).limit(1))
+        order_id = await session.scalar(
+            select(models.ProductOrder.id).order_by(models.ProductOrder.items_count.desc()).limit(1)
+        )
+        return Context(seller, admin or seller, article, order_id, password)
+
+
+async def run_case(name: str, case, context: Context, repeat: int, per_page: int) -> None:
+    latencies: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        async with session_factory() as session:
+            call_started = time.perf_counter()
+            try:
+                await case(session, context, per_page)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    report(summarize(name, latencies, elapsed, errors))
+
+
+async def main(args: argparse.Namespace) -> None:
+    if not args.with_cache:
+        catalog_cache.ttl = 0
+        employee_cache.size = 0
+    cases = READ_CASES | (WRITE_CASES if args.writes else {})
+    if args.cases:
+        unknown = set(args.cases) - (READ_CASES.keys() | WRITE_CASES.keys())
+        if unknown:
+            raise SystemExit(f"Unknown cases: {', '.join(sorted(unknown))}")
+        cases = {name: (READ_CASES | WRITE_CASES)[name] for name in args.cases}
+
+    context = await load_context(args.password)
+    for name, case in cases.items():
+        # one untimed call warms the connection pool and the statement caches
+        async with session_factory() as session:
+            await case(session, context, args.per_page)
+        await run_case(name, case, context, args.repeat, args.per_page)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--cases", nargs="+")
+    parser.add_argument("--writes", action="store_true", help="also run the cases that modify data")
+    parser.add_argument("--with-cache", action="store_true", help="keep the catalog cache on")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,124 @@
+"""Concurrency stress test for stock reservation in create_sales_request.
+
+Creates a product with ``--stock`` units and lets ``--concurrency`` sellers
+reserve ``--quantity`` units each until ``--requests`` attempts were made,
+once with the previous read-modify-write code and once with the atomic
+``UPDATE ... WHERE quantity >= :q RETURNING id``. Reports throughput and
+whether more units were sold than were in stock::
+
+    python -m benchmarks.stock --stock 1000 --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from sqlalchemy import delete, func, select
+
+import models
+import schemas.products as products_schemas
+from backend.session import engine, session_factory
+from benchmarks.stats import report, summarize
+from schemas.base import OkResponseSchema
+from services import ProductsService
+
+
+async def read_modify_write(service: ProductsService, sales_request: products_schemas.SalesRequest) -> OkResponseSchema:
+    """create_sales_request as it was before the atomic reservation."""
+    stmt = select(models.Product).where(models.Product.article == sales_request.article)
+    result = await service.session.execute(stmt)
+    product: models.Product | None = result.scalars().first()
+
+    if not product:
+        return OkResponseSchema(ok=False, message="Товар не найден")
+
+    if product.quantity < sales_request.quantity:
+        return OkResponseSchema(ok=False, message="Недостаточно товара на складе")
+
+    product.quantity -= sales_request.quantity
+    service.session.add(
+        models.SalesRequests(
+            user_id=sales_request.user_id,
+            product_id=product.id,
+            price=sales_request.price,
+            quantity=sales_request.quantity,
+            income=sales_request.income,
+        )
+    )
+    await service.session.commit()
+    return OkResponseSchema(ok=True)
+
+
+async def atomic(service: ProductsService, sales_request: products_schemas.SalesRequest) -> OkResponseSchema:
+    return await service.create_sales_request(sales_request)
+
+
+async def run(name: str, implementation, args: argparse.Namespace, user_id: int) -> None:
+    article = f"bench-{os.urandom(6).hex()}"
+    async with session_factory() as session:
+        product = models.Product(name=article, article=article, description="", price=1, quantity=args.stock)
+        session.add(product)
+        await session.commit()
+        product_id = product.id
+
+    sales_request = products_schemas.SalesRequest(
+        article=article,
+        quantity=args.quantity,
+        price=1,
+        user_id=user_id,
+        income=0,
+    )
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def reserve() -> None:
+        async with semaphore, session_factory() as session:
+            started = time.perf_counter()
+            await implementation(ProductsService(session), sales_request)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(reserve() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        sold = await session.scalar(
+            select(func.coalesce(func.sum(models.SalesRequests.quantity), 0)).where(
+                models.SalesRequests.product_id == product_id
+            )
+        )
+        remaining = await session.scalar(select(models.Product.quantity).where(models.Product.id == product_id))
+        await session.execute(delete(models.SalesRequests).where(models.SalesRequests.product_id == product_id))
+        await session.execute(delete(models.Product).where(models.Product.id == product_id))
+        await session.commit()
+
+    result = summarize(name, latencies, elapsed)
+    result.update(
+        stock=args.stock,
+        sold=sold,
+        remaining=remaining,
+        oversold=max(sold - args.stock, 0),
+        lost_updates=sold - (args.stock - remaining),
+    )
+    report(result)
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with session_factory() as session:
+        user_id = await session.scalar(select(models.User.id).limit(1))
+    if user_id is None:
+        raise SystemExit("At least one user is required")
+
+    await run("read-modify-write", read_modify_write, args, user_id)
+    await run("atomic", atomic, args, user_id)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from backend.session import session_factory
+from services import ProductsService
+from services.product_import import detect_format, iter_rows
+
+
+async def main(path: Path):
+    import_format = detect_format(path.name)
+    async with session_factory() as session:
+        service = ProductsService(session)
+        with path.open("rb") as file:
+            async for event in service.import_products(iter_rows(file, import_format)):
+                if event.type == "error":
+                    print(f"row {event.row}: {event.message}")
+                else:
+                    print(f"{event.type}: processed={event.processed} upserted={event.upserted} failed={event.failed}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import or update products from a CSV, XLSX or JSON Lines file")
+    parser.add_argument("path", type=Path)
+    args = parser.parse_args()
+    asyncio.run(main(args.path))
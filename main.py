@@ -1,14 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 import routers
+from backend.instrumentation import InstrumentationMiddleware
+from backend.pdf import pdf_renderer
+from backend.replicas import ReadYourWritesMiddleware, replica_router
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await pdf_renderer.start()
+    await replica_router.start()
+    yield
+    await replica_router.stop()
+    pdf_renderer.stop()
+
 
 origins = ["http://localhost:5173"]
 app = FastAPI(
     separate_input_output_schemas=False,
     root_path="/api",
+    lifespan=lifespan,
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -16,7 +33,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(InstrumentationMiddleware)
 
 app.include_router(routers.user_router)
 app.include_router(routers.products_router)
-
+app.include_router(routers.reports_router)
+app.include_router(routers.metrics_router)
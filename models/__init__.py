@@ -3,5 +3,6 @@ from sqlalchemy.orm import configure_mappers
 from .base import BaseModel
 from .basics import *
 from .products import *
+from .reports import *
 
 configure_mappers()
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import BaseModel
@@ -5,6 +6,18 @@ from .base import BaseModel
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        # one partial index per permission bit, used by SecurityService.permission_condition
+        Index("ix_users_permission_manage_users", text("id DESC"), postgresql_where=text("(permission & 1) = 1")),
+        Index("ix_users_permission_manage_products", text("id DESC"), postgresql_where=text("(permission & 2) = 2")),
+        Index("ix_users_permission_sell_products", text("id DESC"), postgresql_where=text("(permission & 4) = 4")),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True,
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import Computed, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel
@@ -8,6 +9,25 @@ from .base import BaseModel
 
 class Product(BaseModel):
     __tablename__ = "products"
+    __table_args__ = (
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_products_article_trgm",
+            "article",
+            postgresql_using="gin",
+            postgresql_ops={"article": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_products_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True,
@@ -22,12 +42,20 @@ class Product(BaseModel):
     article: Mapped[str] = mapped_column(
         comment="Артикул товара",
         index=True,
+        unique=True,
     )
 
     description: Mapped[str] = mapped_column(
         comment="Описание товара",
     )
 
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('russian', description)", persisted=True),
+        deferred=True,
+        comment="Поисковый вектор описания товара",
+    )
+
     price: Mapped[float] = mapped_column(
         comment="Цена товара",
     )
@@ -39,6 +67,15 @@ class Product(BaseModel):
 
 class SalesRequests(BaseModel):
     __tablename__ = "sales_requests"
+    __table_args__ = (
+        # open requests of a seller, newest first (/products/sales-list)
+        Index(
+            "ix_sales_requests_open_user_id",
+            "user_id",
+            text("id DESC"),
+            postgresql_where=text("product_order_id IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True,
@@ -73,11 +110,16 @@ class SalesRequests(BaseModel):
     product_order_id: Mapped[int | None] = mapped_column(
         ForeignKey("product_orders.id"),
         comment="ID реализации на товар",
+        index=True,
     )
 
 
 class ProductOrder(BaseModel):
     __tablename__ = "product_orders"
+    __table_args__ = (
+        # orders of a seller, newest first (/products/list-product-orders)
+        Index("ix_product_orders_user_id_id", "user_id", text("id DESC")),
+    )
 
     id: Mapped[int] = mapped_column(
         primary_key=True,
@@ -96,4 +138,19 @@ class ProductOrder(BaseModel):
         comment="ID пользователя",
     )
 
-    realization_date: Mapped[datetime] = mapped_column(comment="Дата реализации", default=datetime.now())
+    realization_date: Mapped[datetime] = mapped_column(comment="Дата реализации", default=datetime.now)
+
+    total_price: Mapped[float] = mapped_column(
+        comment="Итоговая цена товаров",
+        server_default="0",
+    )
+
+    total_income: Mapped[float] = mapped_column(
+        comment="Итоговый доход сотрудника",
+        server_default="0",
+    )
+
+    items_count: Mapped[int] = mapped_column(
+        comment="Количество запросов на реализацию в ордере",
+        server_default="0",
+    )
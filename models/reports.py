@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class SalesDailyRollup(BaseModel):
+    __tablename__ = "sales_daily_rollups"
+
+    day: Mapped[date] = mapped_column(
+        primary_key=True,
+        comment="День реализации",
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("products.id"),
+        primary_key=True,
+        index=True,
+        comment="ID товара",
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id"),
+        primary_key=True,
+        index=True,
+        comment="ID продавца",
+    )
+
+    requests_count: Mapped[int] = mapped_column(
+        comment="Количество запросов на реализацию",
+        server_default="0",
+    )
+
+    quantity: Mapped[int] = mapped_column(
+        comment="Количество проданного товара",
+        server_default="0",
+    )
+
+    revenue: Mapped[float] = mapped_column(
+        comment="Выручка",
+        server_default="0",
+    )
+
+    income: Mapped[float] = mapped_column(
+        comment="Доход продавца",
+        server_default="0",
+    )
+
+    finished_quantity: Mapped[int] = mapped_column(
+        comment="Количество товара в завершенных ордерах",
+        server_default="0",
+    )
+
+    finished_revenue: Mapped[float] = mapped_column(
+        comment="Выручка по завершенным ордерам",
+        server_default="0",
+    )
+
+    finished_income: Mapped[float] = mapped_column(
+        comment="Доход продавца по завершенным ордерам",
+        server_default="0",
+    )
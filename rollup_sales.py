@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from backend.session import session_factory
+from schemas.reports import RollupRange
+from services import ReportsService
+
+
+async def main(command: str, rollup_range: RollupRange):
+    async with session_factory() as session:
+        service = ReportsService(session)
+        if command == "rebuild":
+            result = await service.rebuild_rollups(rollup_range)
+            print(f"rebuilt {result.rows} rollup rows")
+            return
+
+        result = await service.check_rollups(rollup_range)
+        print(f"checked {result.checked} rollup rows")
+        for mismatch in result.mismatches:
+            print(
+                f"{mismatch.day} product={mismatch.product_id} seller={mismatch.user_id} "
+                f"{mismatch.field}: rollup={mismatch.rollup} raw={mismatch.raw}"
+            )
+        if not result.ok:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or check the daily sales rollups of a date range")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--date-from", type=date.fromisoformat, default=date.today() - timedelta(days=1))
+    parser.add_argument("--date-to", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+    asyncio.run(main(args.command, RollupRange(date_from=args.date_from, date_to=args.date_to)))
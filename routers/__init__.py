@@ -1,2 +1,4 @@
 from .user import user_router
 from .products import products_router
+from .metrics import metrics_router
+from .reports import reports_router
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from backend.catalog_cache import catalog_cache
+from backend.instrumentation import instrumentation
+from backend.pdf import pdf_renderer
+from backend.pdf_cache import pdf_cache
+from backend.responses import DefaultRoute
+from backend.session import engine
+from schemas.metrics import CatalogCacheStats, DbPoolStats, PdfRendererStats, PdfCacheStats, SlowQuery
+from schemas.security import Permission
+from services import SecurityService
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_USERS,
+                ]
+            )
+        )
+    ],
+    route_class=DefaultRoute,
+)
+
+
+@metrics_router.get(
+    "",
+    response_class=PlainTextResponse,
+    operation_id="get_prometheus_metrics",
+)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(instrumentation.render(), media_type="text/plain; version=0.0.4")
+
+
+@metrics_router.get(
+    "/slow-queries",
+    response_model=list[SlowQuery],
+    operation_id="get_slow_queries",
+)
+async def get_slow_queries() -> list[SlowQuery]:
+    return instrumentation.slow_queries()
+
+
+@metrics_router.get(
+    "/pdf",
+    response_model=PdfRendererStats,
+    operation_id="get_pdf_metrics",
+)
+async def get_pdf_metrics() -> PdfRendererStats:
+    return pdf_renderer.stats()
+
+
+@metrics_router.get(
+    "/pdf-cache",
+    response_model=PdfCacheStats,
+    operation_id="get_pdf_cache_metrics",
+)
+async def get_pdf_cache_metrics() -> PdfCacheStats:
+    return pdf_cache.stats()
+
+
+@metrics_router.get(
+    "/db-pool",
+    response_model=DbPoolStats,
+    operation_id="get_db_pool_metrics",
+)
+async def get_db_pool_metrics() -> DbPoolStats:
+    return engine.pool.stats()
+
+
+@metrics_router.get(
+    "/catalog-cache",
+    response_model=CatalogCacheStats,
+    operation_id="get_catalog_cache_metrics",
+)
+async def get_catalog_cache_metrics() -> CatalogCacheStats:
+    return await catalog_cache.stats()
@@ -1,25 +1,36 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 
-from backend.dependecies import SessionDependency
-from schemas.base import OkResponseSchema, FileResponse
+from backend.dependecies import SessionDependency, PrincipalDependency, ReadSessionDependency
+from backend.replicas import read_session
+from backend.responses import DefaultRoute
+from backend.session import session_factory
+from schemas.base import ExportFormat, OkResponseSchema, FileResponse
 from schemas.products import (
     ProductListFilter,
     ProductList,
     ProductEditRequest,
     SalesRequest,
+    SalesRequestBatch,
+    SalesRequestBatchResponse,
+    SalesRequestFilter,
     ProductOrdersRequest,
     ProductOrderResponse,
     FinishProductRequest,
     DownloadProductOrderRequest,
     SalesUserResponse,
     CreateProductOrderRequest,
+    CreateProductOrderResponse,
 )
 from schemas.security import Permission
 from services import SecurityService, ProductsService
+from services.export import EXPORT_MEDIA_TYPES, stream_rows
+from services.product_import import detect_format, iter_rows
 
 products_router = APIRouter(
     prefix="/products",
     tags=["products"],
+    route_class=DefaultRoute,
 )
 
 
@@ -39,7 +50,7 @@ products_router = APIRouter(
 )
 async def get_products_list(
     products_list_filter: ProductListFilter,
-    session: SessionDependency,
+    session: ReadSessionDependency,
 ) -> ProductList:
     service = ProductsService(session)
     return await service.get_products_list(products_list_filter)
@@ -89,6 +100,33 @@ async def edit_product(
     return await service.edit_product(product_edit_request)
 
 
+@products_router.post(
+    "/import",
+    operation_id="import_products",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def import_products(file: UploadFile) -> StreamingResponse:
+    import_format = detect_format(file.filename)
+
+    async def events():
+        async with session_factory() as session:
+            service = ProductsService(session)
+            async for event in service.import_products(iter_rows(file.file, import_format)):
+                yield event.serialize_str() + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
 @products_router.post(
     "/create-sales-request",
     operation_id="create_sales_request",
@@ -111,6 +149,28 @@ async def create_sales_request(
     return await service.create_sales_request(sales_request)
 
 
+@products_router.post(
+    "/create-sales-requests",
+    operation_id="create_sales_requests",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_model=SalesRequestBatchResponse,
+)
+async def create_sales_requests(
+    batch: SalesRequestBatch,
+    session: SessionDependency,
+) -> SalesRequestBatchResponse:
+    service = ProductsService(session)
+    return await service.create_sales_requests(batch)
+
+
 @products_router.post(
     "/list-product-orders",
     operation_id="list_product_orders",
@@ -126,12 +186,12 @@ async def create_sales_request(
     response_model=ProductOrderResponse,
 )
 async def list_product_orders(
-    session: SessionDependency,
+    session: ReadSessionDependency,
     orders_request: ProductOrdersRequest,
-    request: Request,
+    principal: PrincipalDependency,
 ) -> ProductOrderResponse:
     service = ProductsService(session)
-    return await service.list_product_orders(orders_request, request)
+    return await service.list_product_orders(orders_request, principal)
 
 
 @products_router.post(
@@ -169,12 +229,35 @@ async def list_product_orders(
         )
     ],
     response_model=FileResponse,
+    deprecated=True,
 )
-async def get_order_pdf(session: SessionDependency, request: DownloadProductOrderRequest) -> FileResponse:
+async def get_order_pdf(session: ReadSessionDependency, request: DownloadProductOrderRequest) -> FileResponse:
     service = ProductsService(session)
     return await service.get_order_pdf(request.id)
 
 
+@products_router.get(
+    "/orders/{order_id}/pdf",
+    operation_id="download_order_pdf",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.SELL_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/pdf": {}}}, 304: {"description": "Not Modified"}},
+)
+async def download_order_pdf(
+    session: ReadSessionDependency, principal: PrincipalDependency, order_id: int, request: Request
+) -> Response:
+    service = ProductsService(session)
+    return await service.stream_order_pdf(order_id, request, principal)
+
+
 @products_router.post(
     "/sales-list",
     operation_id="get_sales_list",
@@ -189,9 +272,13 @@ async def get_order_pdf(session: SessionDependency, request: DownloadProductOrde
     ],
     response_model=SalesUserResponse,
 )
-async def get_order_pdf(session: SessionDependency, request: Request) -> SalesUserResponse:
+async def get_order_pdf(
+    session: ReadSessionDependency,
+    sales_request_filter: SalesRequestFilter,
+    principal: PrincipalDependency,
+) -> SalesUserResponse:
     service = ProductsService(session)
-    return await service.get_sales_requests(request)
+    return await service.get_sales_requests(sales_request_filter, principal)
 
 
 @products_router.post(
@@ -206,10 +293,96 @@ async def get_order_pdf(session: SessionDependency, request: Request) -> SalesUs
             )
         )
     ],
-    response_model=OkResponseSchema,
+    response_model=CreateProductOrderResponse,
 )
 async def create_order(
-    session: SessionDependency, create_request: CreateProductOrderRequest, request: Request
-) -> OkResponseSchema:
+    session: SessionDependency, create_request: CreateProductOrderRequest, principal: PrincipalDependency
+) -> CreateProductOrderResponse:
     service = ProductsService(session)
-    return await service.create_product_order(create_request, request)
+    return await service.create_product_order(create_request, principal)
+
+
+def export_response(request: Request, name: str, stmt_factory, export_format: ExportFormat) -> StreamingResponse:
+    async def chunks():
+        async with read_session(request) as session:
+            stmt = stmt_factory(ProductsService(session))
+            async for chunk in stream_rows(session, stmt, export_format):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@products_router.get(
+    "/export/products",
+    operation_id="export_products",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.SELL_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_class=StreamingResponse,
+)
+async def export_products(
+    request: Request,
+    keyword: str = "",
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    return export_response(request, "products", lambda service: service.export_products_stmt(keyword), export_format)
+
+
+@products_router.get(
+    "/export/orders",
+    operation_id="export_orders",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.SELL_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_class=StreamingResponse,
+)
+async def export_orders(
+    request: Request,
+    principal: PrincipalDependency,
+    keyword: str = "",
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    return export_response(
+        request, "orders", lambda service: service.export_orders_stmt(keyword, principal), export_format
+    )
+
+
+@products_router.get(
+    "/export/sales",
+    operation_id="export_sales",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.SELL_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_class=StreamingResponse,
+)
+async def export_sales(
+    request: Request,
+    principal: PrincipalDependency,
+    keyword: str = "",
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    return export_response(
+        request, "sales", lambda service: service.export_sales_stmt(keyword, principal), export_format
+    )
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends
+
+from backend.dependecies import ReadSessionDependency, SessionDependency
+from backend.responses import DefaultRoute
+from schemas.reports import (
+    RollupCheckResponse,
+    RollupRange,
+    RollupRebuildResponse,
+    SalesReport,
+    SalesReportRequest,
+)
+from schemas.security import Permission
+from services import ReportsService, SecurityService
+
+reports_router = APIRouter(
+    prefix="/reports",
+    tags=["reports"],
+    route_class=DefaultRoute,
+)
+
+
+@reports_router.post(
+    "/sales",
+    operation_id="get_sales_report",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_model=SalesReport,
+)
+async def get_sales_report(
+    report_request: SalesReportRequest,
+    session: ReadSessionDependency,
+) -> SalesReport:
+    service = ReportsService(session)
+    return await service.get_sales_report(report_request)
+
+
+@reports_router.post(
+    "/rollups/check",
+    operation_id="check_sales_rollups",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_model=RollupCheckResponse,
+)
+async def check_sales_rollups(
+    rollup_range: RollupRange,
+    session: SessionDependency,
+) -> RollupCheckResponse:
+    service = ReportsService(session)
+    return await service.check_rollups(rollup_range)
+
+
+@reports_router.post(
+    "/rollups/rebuild",
+    operation_id="rebuild_sales_rollups",
+    dependencies=[
+        Depends(
+            SecurityService.authenticate(
+                [
+                    Permission.MANAGE_PRODUCTS,
+                ]
+            )
+        )
+    ],
+    response_model=RollupRebuildResponse,
+)
+async def rebuild_sales_rollups(
+    rollup_range: RollupRange,
+    session: SessionDependency,
+) -> RollupRebuildResponse:
+    service = ReportsService(session)
+    return await service.rebuild_rollups(rollup_range)
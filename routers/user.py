@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Response, Depends
+from typing import Annotated
 
-from backend.dependecies import SessionDependency
+from fastapi import APIRouter, Depends, Query, Response
+
+from backend.dependecies import SessionDependency, ReadSessionDependency
+from backend.responses import DefaultRoute
 from schemas import security as security_schemas
 from schemas.base import OkResponseSchema
 from schemas.security import Permission, UserList
@@ -9,6 +12,7 @@ from services import SecurityService
 user_router = APIRouter(
     prefix="/user",
     tags=["user"],
+    route_class=DefaultRoute,
 )
 
 
@@ -64,7 +68,7 @@ async def create_user(
 )
 async def create_user(
     user_list_filter: security_schemas.UserListFilter,
-    session: SessionDependency,
+    session: ReadSessionDependency,
 ) -> UserList:
     service = SecurityService(session)
     return await service.list_users(user_list_filter)
@@ -91,6 +95,7 @@ async def edit_user(
     service = SecurityService(session)
     return await service.edit_user(user_data)
 
+
 @user_router.get(
     "/employees",
     dependencies=[
@@ -106,7 +111,8 @@ async def edit_user(
     operation_id="list_employees",
 )
 async def list_employees(
+    employee_list_filter: Annotated[security_schemas.EmployeeListFilter, Query()],
     session: SessionDependency,
 ) -> security_schemas.EmployeeList:
     service = SecurityService(session)
-    return await service.list_employees()
\ No newline at end of file
+    return await service.list_employees(employee_list_filter)
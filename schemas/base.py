@@ -1,6 +1,7 @@
+from enum import StrEnum, unique
 from typing import Any, Self
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
 
@@ -31,13 +32,36 @@ class OkResponseSchema(ApiModel):
     message: str = ""
 
 
+@unique
+class CountStrategy(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    WINDOW = "window"
+
+
+@unique
+class ExportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+# Largest page a list endpoint returns
+MAX_PER_PAGE = 1000
+
+
 class PaginationRequest(ApiModel):
-    page: int
-    per_page: int
+    page: int = Field(1, ge=1)
+    per_page: int = Field(gt=0, le=MAX_PER_PAGE)
+    after: str | None = None
+    count_strategy: CountStrategy = CountStrategy.EXACT
 
 
 class PaginationResponse(ApiModel):
     row_count: int
+    row_count_exact: bool = True
+    next_cursor: str | None = None
+    has_more: bool = False
 
 
 class FileResponse(ApiModel):
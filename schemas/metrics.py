@@ -0,0 +1,54 @@
+from .base import ApiModel
+
+
+class PdfRendererStats(ApiModel):
+    workers: int
+    queue_size: int
+    in_flight: int
+    queue_depth: int
+    rendered: int
+    rejected: int
+    timed_out: int
+    failed: int
+    render_seconds_total: float
+    render_seconds_max: float
+
+
+class PdfCacheStats(ApiModel):
+    size: int
+    entries: int
+    hits: int
+    misses: int
+
+
+class DbPoolStats(ApiModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class CatalogCacheStats(ApiModel):
+    enabled: bool
+    shared_tier: str | None
+    version: int
+    bumped_at: float
+    size: int
+    entries: int
+    hits: int
+    misses: int
+    shared_hits: int
+    shared_misses: int
+    bumps: int
+
+
+class SlowQuery(ApiModel):
+    statement: str
+    parameters: list | dict | None
+    duration_seconds: float
+    recorded_at: float
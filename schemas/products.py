@@ -1,5 +1,8 @@
 from datetime import datetime
-from schemas.base import ApiModel, PaginationResponse, PaginationRequest
+
+from pydantic import Field
+
+from schemas.base import ApiModel, OkResponseSchema, PaginationResponse, PaginationRequest
 
 
 class ProductItem(ApiModel):
@@ -18,6 +21,8 @@ class ProductList(ApiModel):
 
 class ProductListFilter(ApiModel):
     keyword: str = ""
+    search_description: bool = False
+    order_by_relevance: bool = False
     pagination: PaginationRequest
 
 
@@ -29,6 +34,24 @@ class ProductEditRequest(ApiModel):
     quantity: int
 
 
+# Largest value of an integer column
+MAX_INT4 = 2**31 - 1
+
+
+class ProductImportRow(ProductEditRequest):
+    price: float = Field(ge=0, allow_inf_nan=False)
+    quantity: int = Field(ge=0, le=MAX_INT4)
+
+
+class ProductImportEvent(ApiModel):
+    type: str
+    processed: int = 0
+    upserted: int = 0
+    failed: int = 0
+    row: int | None = None
+    message: str = ""
+
+
 class SalesRequest(ApiModel):
     article: str
     quantity: int
@@ -37,6 +60,21 @@ class SalesRequest(ApiModel):
     income: float
 
 
+class SalesRequestBatch(ApiModel):
+    items: list[SalesRequest]
+    all_or_nothing: bool = True
+
+
+class SalesRequestResult(ApiModel):
+    article: str
+    ok: bool
+    message: str = ""
+
+
+class SalesRequestBatchResponse(OkResponseSchema):
+    results: list[SalesRequestResult]
+
+
 class ProductOrdersRequest(ApiModel):
     keyword: str = ""
     pagination: PaginationRequest
@@ -79,7 +117,13 @@ class SalesItem(ApiModel):
 
 class SalesUserResponse(ApiModel):
     items: list[SalesItem]
+    pagination_info: PaginationResponse
 
 
 class CreateProductOrderRequest(ApiModel):
     ids: list[int]
+
+
+class CreateProductOrderResponse(OkResponseSchema):
+    order_id: int | None = None
+    attached: int = 0
@@ -0,0 +1,60 @@
+from datetime import date
+from enum import StrEnum, unique
+
+from .base import ApiModel, OkResponseSchema
+
+
+@unique
+class ReportPeriod(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    TOTAL = "total"
+
+
+class RollupRange(ApiModel):
+    date_from: date
+    date_to: date
+
+
+class SalesReportRequest(RollupRange):
+    period: ReportPeriod = ReportPeriod.DAY
+    by_product: bool = False
+    by_seller: bool = False
+    finished_only: bool = False
+
+
+class SalesReportRow(ApiModel):
+    period_start: date | None = None
+    product_id: int | None = None
+    article: str | None = None
+    product_name: str | None = None
+    user_id: int | None = None
+    username: str | None = None
+    quantity: int
+    revenue: float
+    income: float
+
+
+class SalesReport(ApiModel):
+    rows: list[SalesReportRow]
+    quantity: int
+    revenue: float
+    income: float
+
+
+class RollupMismatch(ApiModel):
+    day: date
+    product_id: int
+    user_id: int
+    field: str
+    rollup: float
+    raw: float
+
+
+class RollupCheckResponse(OkResponseSchema):
+    checked: int
+    mismatches: list[RollupMismatch]
+
+
+class RollupRebuildResponse(OkResponseSchema):
+    rows: int
@@ -1,6 +1,8 @@
 from enum import IntEnum, unique
 
-from .base import ApiModel, PaginationResponse, PaginationRequest
+from pydantic import Field
+
+from .base import MAX_PER_PAGE, ApiModel, PaginationResponse, PaginationRequest
 
 
 @unique
@@ -32,8 +34,16 @@ class Employee(ApiModel):
     id: int
 
 
+class EmployeeListFilter(PaginationRequest):
+    """Query parameters of /user/employees, a page of sellers matching ``keyword``."""
+
+    keyword: str = ""
+    per_page: int = Field(100, gt=0, le=MAX_PER_PAGE)
+
+
 class EmployeeList(ApiModel):
     employees: list[Employee]
+    pagination_info: PaginationResponse
 
 
 class LoginResponse(ApiModel):
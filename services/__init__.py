@@ -1,2 +1,3 @@
 from .security import SecurityService
+from .reports import ReportsService
 from .products import ProductsService
@@ -1,6 +1,21 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from schemas.base import PaginationRequest, PaginationResponse
-from sqlalchemy import select, func
+from backend.cache import TTLCache
+from backend.config import COUNT_CACHE_SIZE, COUNT_CACHE_TTL
+from backend.explain import Explain, parse_plan
+from schemas.base import CountStrategy, PaginationRequest, PaginationResponse
+from sqlalchemy import select, func, text
+
+count_cache = TTLCache(size=COUNT_CACHE_SIZE, ttl=COUNT_CACHE_TTL)
+
+T = TypeVar("T")
 
 
 class BaseService:
@@ -10,15 +25,143 @@ class BaseService:
         self.session = session
 
     @staticmethod
-    def apply_pagination(stmt, pagination: PaginationRequest):
-        return stmt.offset((pagination.page - 1) * pagination.per_page).limit(pagination.per_page)
+    def encode_cursor(row_id: int) -> str:
+        return base64.urlsafe_b64encode(json.dumps({"id": row_id}).encode()).decode("ascii")
 
-    async def get_pagination_info(self, stmt) -> PaginationResponse:
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        try:
+            row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["id"]
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            row_id = None
+        if not isinstance(row_id, int):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+        return row_id
+
+    @staticmethod
+    def apply_pagination(stmt, pagination: PaginationRequest, cursor_column=None):
+        """Limit ``stmt`` to one page plus a lookahead row used to detect ``has_more``.
+
+        With ``pagination.after`` set the page is seeked by ``cursor_column``
+        (statements must be ordered by it descending), otherwise OFFSET is used.
+        """
+        if pagination.after and cursor_column is not None:
+            stmt = stmt.where(cursor_column < BaseService.decode_cursor(pagination.after))
+        else:
+            stmt = stmt.offset((pagination.page - 1) * pagination.per_page)
+        return stmt.limit(pagination.per_page + 1)
+
+    @staticmethod
+    def apply_page_info(
+        rows: Sequence,
+        pagination: PaginationRequest,
+        pagination_info: PaginationResponse,
+        with_cursor: bool = True,
+    ) -> Sequence:
+        has_more = len(rows) > pagination.per_page
+        rows = rows[: pagination.per_page]
+        # an empty page has no row to put in the cursor
+        has_more = has_more and bool(rows)
+        pagination_info.has_more = has_more
+        if has_more and with_cursor:
+            pagination_info.next_cursor = BaseService.encode_cursor(rows[-1].id)
+        else:
+            pagination_info.next_cursor = None
+        return rows
+
+    async def count_exact(self, stmt) -> int:
         count_stmt = select(
             func.count(),
         ).select_from(stmt.subquery())
 
         result = await self.session.execute(count_stmt)
-        total: int = result.scalar()
+        return result.scalar()
+
+    async def count_cached(self, stmt) -> int:
+        compiled = stmt.compile()
+        key = (str(compiled), tuple(sorted((name, str(value)) for name, value in compiled.params.items())))
+        total = count_cache.get(key)
+        if total is None:
+            total = await self.count_exact(stmt)
+            count_cache.set(key, total)
+        return total
+
+    async def count_estimated(self, stmt, count_table: str | None = None) -> int | None:
+        if stmt.whereclause is None and count_table is not None:
+            result = await self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": count_table},
+            )
+            estimate = result.scalar()
+        else:
+            result = await self.session.execute(Explain(stmt))
+            estimate = int(parse_plan(result.scalar())["Plan Rows"])
+        # reltuples is -1 for tables that were never vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    async def get_pagination_info(
+        self,
+        stmt,
+        strategy: CountStrategy = CountStrategy.EXACT,
+        count_table: str | None = None,
+    ) -> PaginationResponse:
+        if strategy == CountStrategy.ESTIMATED:
+            estimate = await self.count_estimated(stmt, count_table)
+            if estimate is not None:
+                return PaginationResponse(row_count=estimate, row_count_exact=False)
+        elif strategy == CountStrategy.CACHED:
+            return PaginationResponse(row_count=await self.count_cached(stmt), row_count_exact=False)
+
+        return PaginationResponse(row_count=await self.count_exact(stmt))
+
+    async def paginate(
+        self,
+        stmt,
+        pagination: PaginationRequest,
+        cursor_column,
+        count_table: str | None = None,
+    ) -> tuple[Sequence, PaginationResponse]:
+        """Fetch one page of ``stmt`` together with its row count.
+
+        The WINDOW strategy computes the count with ``count(*) OVER ()`` in the
+        page query itself, so the request costs a single round-trip, but the
+        database reads every matching row before the LIMIT. With a cursor that
+        would undo the seek and count only the rows after the cursor, so cursor
+        pages fall back to the estimated count.
+
+        Statements not ordered by a cursor column pass ``cursor_column=None``;
+        they are paged by number only and get no ``next_cursor``.
+        """
+        strategy = pagination.count_strategy
+        if strategy == CountStrategy.WINDOW and pagination.after:
+            strategy = CountStrategy.ESTIMATED
+        if strategy == CountStrategy.WINDOW:
+            page_stmt = stmt.add_columns(func.count().over().label("row_count"))
+            pagination_info = None
+        else:
+            page_stmt = stmt
+            pagination_info = await self.get_pagination_info(stmt, strategy, count_table)
+
+        result = await self.session.execute(self.apply_pagination(page_stmt, pagination, cursor_column))
+        rows = result.all()
+
+        if pagination_info is None:
+            if rows:
+                pagination_info = PaginationResponse(row_count=rows[0].row_count)
+            else:
+                pagination_info = await self.get_pagination_info(stmt)
+
+        rows = self.apply_page_info(rows, pagination, pagination_info, with_cursor=cursor_column is not None)
+        return rows, pagination_info
+
+    @staticmethod
+    def project(adapter: TypeAdapter[list[T]], rows: Sequence) -> list[T]:
+        """Validate rows of a column select into response schemas in one call.
 
-        return PaginationResponse(row_count=total)
+        Rows are matched to schema fields by column name, so the select has to
+        label its columns with the field names. Extra columns are ignored.
+        """
+        return adapter.validate_python([row._mapping for row in rows])
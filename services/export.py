@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from pydantic.alias_generators import to_camel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.base import ExportFormat
+
+# Rows fetched per server-side cursor round-trip, also the size of one response chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_rows(session: AsyncSession, stmt, export_format: ExportFormat) -> AsyncIterator[str]:
+    """Serialize the rows of ``stmt`` read through a server-side cursor, one batch at a time."""
+    result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    keys = [to_camel(key) for key in result.keys()]
+
+    if export_format == ExportFormat.CSV:
+        # BOM so spreadsheet applications detect UTF-8
+        yield "\ufeff" + _csv_chunk([keys])
+        async for partition in result.partitions():
+            yield _csv_chunk(partition)
+    else:
+        async for partition in result.partitions():
+            yield "".join(
+                json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=_json_default) + "\n" for row in partition
+            )
@@ -0,0 +1,93 @@
+import codecs
+import csv
+import importlib.util
+import json
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+from fastapi import HTTPException, status
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+# Parsers yield (row number, raw row) pairs, row numbers are 1-based data rows.
+# A row that cannot be parsed at all is yielded as an ImportRowError.
+ImportRows = Iterator[tuple[int, dict[str, Any] | ImportRowError]]
+
+IMPORT_FORMATS = ("csv", "xlsx", "ndjson")
+
+
+def detect_format(filename: str | None) -> str:
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension in ("json", "jsonl"):
+        extension = "ndjson"
+    if extension not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Поддерживаются только файлы CSV, XLSX и JSON Lines",
+        )
+    if extension == "xlsx" and importlib.util.find_spec("openpyxl") is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Импорт XLSX недоступен: не установлен openpyxl",
+        )
+    return extension
+
+
+def iter_csv(file: BinaryIO) -> ImportRows:
+    reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+    row_number = 0
+    while True:
+        row_number += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            # the decoder cannot resume after an invalid byte, the rest of the file is lost
+            yield row_number, ImportRowError(f"Файл не в кодировке UTF-8: {e}")
+            return
+        except csv.Error as e:
+            yield row_number, ImportRowError(f"Некорректная строка CSV: {e}")
+            continue
+        yield row_number, row
+
+
+def iter_ndjson(file: BinaryIO) -> ImportRows:
+    row_number = 0
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield row_number, ImportRowError(f"Некорректный JSON: {e}")
+            continue
+        yield row_number, row if isinstance(row, dict) else ImportRowError("Ожидался JSON объект")
+
+
+def iter_xlsx(file: BinaryIO) -> ImportRows:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for row_number, values in enumerate(rows, start=1):
+            if all(value is None for value in values):
+                continue
+            yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(file: BinaryIO, import_format: str) -> ImportRows:
+    if import_format == "csv":
+        return iter_csv(file)
+    if import_format == "xlsx":
+        return iter_xlsx(file)
+    return iter_ndjson(file)
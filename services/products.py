@@ -1,63 +1,116 @@
 import base64
 import os
-from collections.abc import Sequence
+from collections.abc import AsyncIterator
 from time import strftime
 
-from sqlalchemy import select, func, Integer, or_
+from sqlalchemy import select, insert, update, func, any_, cast, Integer, String, or_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import joinedload
-from weasyprint import HTML
 
 import models
 import schemas.base as base_schemas
 import schemas.products as products_schemas
-from backend.config import TEMPLATES
+from backend.catalog_cache import catalog_cache
+from backend.pdf import pdf_renderer
+from backend.pdf_cache import pdf_cache
+from backend.replicas import replica_router
 from schemas.base import OkResponseSchema, FileResponse
-from services import SecurityService
+from schemas.security import TokenDataSchema
+from services import SecurityService, search
 from services.base import BaseService
-from fastapi import Request
+from services.product_import import ImportRowError, ImportRows
+from services.reports import ReportsService
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+
+ORDER_PDF_TEMPLATE = "product_order.html"
+PDF_CHUNK_SIZE = 64 * 1024
+IMPORT_CHUNK_SIZE = 1000
+# A batch reservation that loses a deadlock is retried this many times in total
+RESERVE_ATTEMPTS = 3
+DEADLOCK_DETECTED = "40P01"
+
+PRODUCT_ITEM_COLUMNS = (
+    models.Product.id,
+    models.Product.name,
+    models.Product.description,
+    models.Product.price,
+    models.Product.article,
+    models.Product.quantity,
+)
+PRODUCT_ITEMS = TypeAdapter(list[products_schemas.ProductItem])
+SALES_ITEMS = TypeAdapter(list[products_schemas.SalesItem])
 
 
 class ProductsService(BaseService):
 
     @staticmethod
-    def apply_keyword_filter(stmt, keyword: str):
+    def apply_keyword_filter(stmt, keyword: str, search_description: bool = False):
         if keyword:
-            stmt = stmt.where(
-                or_(
-                    models.Product.name.ilike(f"%{keyword}%"),
-                    models.Product.article.ilike(f"%{keyword}%"),
-                )
-            )
+            condition = search.keyword_condition(keyword, models.Product.name, models.Product.article)
+            if search_description:
+                condition = or_(condition, search.fulltext_condition(keyword, models.Product.search_vector))
+            stmt = stmt.where(condition)
         return stmt
 
+    @staticmethod
+    def apply_relevance_order(stmt, keyword: str):
+        return stmt.order_by(None).order_by(
+            search.relevance(keyword, models.Product.name, models.Product.article).desc(),
+            models.Product.id.desc(),
+        )
+
     async def get_products_list(
         self, products_list_filter: products_schemas.ProductListFilter
     ) -> products_schemas.ProductList:
-        stmt = select(models.Product).order_by(models.Product.id.desc())
-        stmt = self.apply_keyword_filter(stmt, products_list_filter.keyword)
-
-        pagination_info = await self.get_pagination_info(stmt)
-        stmt = self.apply_pagination(stmt, products_list_filter.pagination)
-
-        result = await self.session.execute(stmt)
-        rows: Sequence[models.Product] = result.scalars().all()
-        products: list[products_schemas.ProductItem] = []
-        for row in rows:
-            products.append(
-                products_schemas.ProductItem(
-                    id=row.id,
-                    name=row.name,
-                    description=row.description,
-                    price=row.price,
-                    article=row.article,
-                    quantity=row.quantity,
+        cache_key = catalog_cache.key(products_list_filter)
+        version, bumped_at, cached = await catalog_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        keyword = catalog_cache.normalize_keyword(products_list_filter.keyword)
+        stmt = select(*PRODUCT_ITEM_COLUMNS).order_by(models.Product.id.desc())
+        stmt = self.apply_keyword_filter(stmt, keyword, products_list_filter.search_description)
+        if products_list_filter.order_by_relevance and keyword:
+            if products_list_filter.pagination.after:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor pagination is not supported with relevance ordering",
                 )
-            )
-
-        return products_schemas.ProductList(
-            products=products,
+            stmt = self.apply_relevance_order(stmt, keyword)
+            # relevance pages are not ordered by id, they can only be paged by number
+            cursor_column = None
+        else:
+            cursor_column = models.Product.id
+
+        rows, pagination_info = await self.paginate(
+            stmt,
+            products_list_filter.pagination,
+            cursor_column,
+            count_table=models.Product.__tablename__,
+        )
+        products_list = products_schemas.ProductList(
+            products=self.project(PRODUCT_ITEMS, rows),
             pagination_info=pagination_info,
         )
+        await catalog_cache.set(
+            cache_key, version, bumped_at, products_list, from_replica=self.session.bind in replica_router.engines
+        )
+        return products_list
+
+    def export_products_stmt(self, keyword: str):
+        stmt = select(
+            models.Product.id,
+            models.Product.name,
+            models.Product.article,
+            models.Product.description,
+            models.Product.price,
+            models.Product.quantity,
+        ).order_by(models.Product.id)
+        return self.apply_keyword_filter(stmt, keyword)
 
     async def create_product(self, product: products_schemas.ProductEditRequest) -> OkResponseSchema:
         stmt = select(models.Product).where(models.Product.article == product.article)
@@ -76,6 +129,7 @@ class ProductsService(BaseService):
         )
         self.session.add(new_product)
         await self.session.commit()
+        await catalog_cache.bump()
 
         return OkResponseSchema(
             ok=True,
@@ -94,84 +148,292 @@ class ProductsService(BaseService):
         existing_product.price = product.price
         existing_product.quantity = product.quantity
         await self.session.commit()
+        await catalog_cache.bump()
 
         return OkResponseSchema(
             ok=True,
         )
 
-    async def create_sales_request(self, sales_request: products_schemas.SalesRequest) -> OkResponseSchema:
-        stmt = select(models.Product).where(models.Product.article == sales_request.article)
-        result = await self.session.execute(stmt)
-        product: models.Product | None = result.scalars().first()
+    async def upsert_products(self, products: list[dict]) -> int:
+        stmt = postgresql.insert(models.Product).values(products)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.Product.article],
+            set_={
+                "name": stmt.excluded.name,
+                "description": stmt.excluded.description,
+                "price": stmt.excluded.price,
+                "quantity": stmt.excluded.quantity,
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+        await catalog_cache.bump()
+        return len(products)
+
+    async def import_products(self, rows: ImportRows) -> AsyncIterator[products_schemas.ProductImportEvent]:
+        """Upsert products from parsed rows in chunks, reporting progress and row errors as events.
+
+        Only one chunk is held in memory at a time; every chunk is committed on
+        its own, so rows imported before a failure are kept. A chunk the
+        database rejects is rolled back and each of its rows is reported.
+        """
+        # article -> (row number, product values)
+        chunk: dict[str, tuple[int, dict]] = {}
+        processed = upserted = failed = 0
+
+        def progress(event_type: str) -> products_schemas.ProductImportEvent:
+            return products_schemas.ProductImportEvent(
+                type=event_type, processed=processed, upserted=upserted, failed=failed
+            )
+
+        async def flush() -> AsyncIterator[products_schemas.ProductImportEvent]:
+            nonlocal upserted, failed
+            try:
+                upserted += await self.upsert_products([product for _, product in chunk.values()])
+            except DBAPIError as e:
+                await self.session.rollback()
+                for row_number, _ in chunk.values():
+                    failed += 1
+                    yield products_schemas.ProductImportEvent(
+                        type="error",
+                        processed=processed,
+                        upserted=upserted,
+                        failed=failed,
+                        row=row_number,
+                        message=f"Ошибка сохранения товара: {e.orig}",
+                    )
+            chunk.clear()
+
+        for row_number, row in rows:
+            processed += 1
+            try:
+                if isinstance(row, ImportRowError):
+                    raise row
+                product = products_schemas.ProductImportRow.deserialize(row)
+            except (ValueError, ValidationError) as e:
+                failed += 1
+                yield products_schemas.ProductImportEvent(
+                    type="error", processed=processed, upserted=upserted, failed=failed, row=row_number, message=str(e)
+                )
+                continue
+
+            # a statement may not upsert the same article twice, the last row wins
+            chunk[product.article] = (row_number, product.serialize(by_alias=False))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                async for event in flush():
+                    yield event
+                yield progress("progress")
 
-        if not product:
-            return OkResponseSchema(ok=False, message="Товар не найден")
+        if chunk:
+            async for event in flush():
+                yield event
+        yield progress("done")
 
-        if product.quantity < sales_request.quantity:
+    async def create_sales_request(self, sales_request: products_schemas.SalesRequest) -> OkResponseSchema:
+        if sales_request.quantity <= 0:
+            return OkResponseSchema(ok=False, message="Некорректное количество товара")
+
+        reserve_stmt = (
+            update(models.Product)
+            .where(
+                models.Product.article == sales_request.article,
+                models.Product.quantity >= sales_request.quantity,
+            )
+            .values(quantity=models.Product.quantity - sales_request.quantity)
+            .returning(models.Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(reserve_stmt)
+        product_id: int | None = result.scalars().first()
+
+        if product_id is None:
+            await self.session.rollback()
+            stmt = select(models.Product.id).where(models.Product.article == sales_request.article)
+            result = await self.session.execute(stmt)
+            if result.first() is None:
+                return OkResponseSchema(ok=False, message="Товар не найден")
             return OkResponseSchema(ok=False, message="Недостаточно товара на складе")
 
-        product.quantity -= sales_request.quantity
-        self.session.add(
-            models.SalesRequests(
+        await self.session.execute(
+            insert(models.SalesRequests).values(
                 user_id=sales_request.user_id,
-                product_id=product.id,
+                product_id=product_id,
                 price=sales_request.price,
                 quantity=sales_request.quantity,
                 income=sales_request.income,
             )
         )
         await self.session.commit()
+        await catalog_cache.bump()
 
         return OkResponseSchema(
             ok=True,
         )
 
+    async def create_sales_requests(
+        self, batch: products_schemas.SalesRequestBatch
+    ) -> products_schemas.SalesRequestBatchResponse:
+        """Reserve stock and create sales requests for a batch of items.
+
+        Requested quantities are summed per article and reserved with one
+        UPDATE ... FROM unnest(...), so items sharing an article succeed or
+        fail together. With ``all_or_nothing`` any failure rolls back the batch.
+        A reservation that deadlocks is retried, then reported as failed.
+        """
+        requested: dict[str, int] = {}
+        for item in batch.items:
+            if item.quantity > 0:
+                requested[item.article] = requested.get(item.article, 0) + item.quantity
+
+        reserved: dict[str, int] = {}
+        if requested:
+            for attempt in range(1, RESERVE_ATTEMPTS + 1):
+                try:
+                    reserved = await self.reserve_stock(requested)
+                    break
+                except DBAPIError as e:
+                    await self.session.rollback()
+                    if getattr(e.orig, "sqlstate", None) != DEADLOCK_DETECTED:
+                        raise
+                    if attempt == RESERVE_ATTEMPTS:
+                        return products_schemas.SalesRequestBatchResponse(
+                            ok=False,
+                            message="Не удалось зарезервировать товары, повторите запрос",
+                            results=[
+                                products_schemas.SalesRequestResult(article=item.article, ok=False, message="Отменено")
+                                for item in batch.items
+                            ],
+                        )
+
+        failed_articles = requested.keys() - reserved.keys()
+        has_invalid_items = any(item.quantity <= 0 for item in batch.items)
+        failed = bool(failed_articles) or has_invalid_items
+        if failed and batch.all_or_nothing:
+            await self.session.rollback()
+            reserved = {}
+
+        messages: dict[str, str] = {}
+        if failed_articles:
+            stmt = select(models.Product.article).where(
+                models.Product.article == any_(cast(list(failed_articles), ARRAY(String)))
+            )
+            result = await self.session.execute(stmt)
+            existing_articles = set(result.scalars().all())
+            for article in failed_articles:
+                if article not in existing_articles:
+                    messages[article] = "Товар не найден"
+                else:
+                    messages[article] = "Недостаточно товара на складе"
+
+        rows = [
+            {
+                "user_id": item.user_id,
+                "product_id": reserved[item.article],
+                "price": item.price,
+                "quantity": item.quantity,
+                "income": item.income,
+            }
+            for item in batch.items
+            if item.quantity > 0 and item.article in reserved
+        ]
+        if rows:
+            await self.session.execute(insert(models.SalesRequests).values(rows))
+            await self.session.commit()
+            await catalog_cache.bump()
+
+        results: list[products_schemas.SalesRequestResult] = []
+        for item in batch.items:
+            if item.quantity <= 0:
+                result_item = products_schemas.SalesRequestResult(
+                    article=item.article, ok=False, message="Некорректное количество товара"
+                )
+            elif item.article in reserved:
+                result_item = products_schemas.SalesRequestResult(article=item.article, ok=True)
+            else:
+                result_item = products_schemas.SalesRequestResult(
+                    article=item.article, ok=False, message=messages.get(item.article, "Отменено")
+                )
+            results.append(result_item)
+
+        if not failed:
+            message = ""
+        elif reserved:
+            message = "Часть товаров не зарезервирована"
+        else:
+            message = "Ни один товар не зарезервирован"
+        return products_schemas.SalesRequestBatchResponse(ok=not failed, message=message, results=results)
+
+    async def reserve_stock(self, requested: dict[str, int]) -> dict[str, int]:
+        """Subtract the requested quantities, return the ids of the reserved articles.
+
+        The product rows are locked in id order before the UPDATE, which would
+        otherwise lock them in the order of the request, so two batches with
+        the same articles in a different order cannot deadlock each other.
+        """
+        articles = cast(list(requested), ARRAY(String))
+        lock_stmt = (
+            select(models.Product.id)
+            .where(models.Product.article == any_(articles))
+            .order_by(models.Product.id)
+            .with_for_update()
+        )
+        await self.session.execute(lock_stmt)
+
+        requested_subquery = select(
+            func.unnest(articles).label("article"),
+            func.unnest(cast(list(requested.values()), ARRAY(Integer))).label("quantity"),
+        ).subquery("requested")
+        reserve_stmt = (
+            update(models.Product)
+            .where(
+                models.Product.article == requested_subquery.c.article,
+                models.Product.quantity >= requested_subquery.c.quantity,
+            )
+            .values(quantity=models.Product.quantity - requested_subquery.c.quantity)
+            .returning(models.Product.article, models.Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(reserve_stmt)
+        return {row.article: row.id for row in result}
+
     @staticmethod
     def apply_keyword_sales_filter(stmt, keyword):
         if keyword:
             stmt = stmt.where(
-                models.User.username.ilike(f"%{keyword}%"),
+                search.keyword_condition(keyword, models.User.username),
             )
         return stmt
 
     @staticmethod
-    def apply_user_id_filter(stmt, request: Request):
-        user_id = SecurityService.get_user_id(request)
-        is_admin = SecurityService.is_admin(request)
-        if not is_admin:
-            stmt = stmt.where(models.ProductOrder.user_id == user_id)
+    def apply_user_id_filter(stmt, principal: TokenDataSchema):
+        if not SecurityService.is_admin_principal(principal):
+            stmt = stmt.where(models.ProductOrder.user_id == principal.user_id)
         return stmt
 
-    async def list_product_orders(
-        self, orders_request: products_schemas.ProductOrdersRequest, request: Request
-    ) -> products_schemas.ProductOrderResponse:
+    def product_orders_stmt(self, keyword: str, principal: TokenDataSchema):
         stmt = (
             select(
                 models.ProductOrder.id.label("id"),
                 models.ProductOrder.realization_date.label("date"),
                 models.User.username.label("username"),
-                func.sum(models.SalesRequests.price * models.SalesRequests.quantity).label("total_price"),
-                func.sum(models.SalesRequests.income * models.SalesRequests.quantity).label("total_income"),
+                models.ProductOrder.total_price.label("total_price"),
+                models.ProductOrder.total_income.label("total_income"),
                 models.ProductOrder.finished.label("finished"),
             )
             .join(models.User, models.ProductOrder.user_id == models.User.id)
-            .join(models.SalesRequests, models.ProductOrder.id == models.SalesRequests.product_order_id)
-            .group_by(
-                models.ProductOrder.id,
-                models.ProductOrder.realization_date,
-                models.User.username,
-                models.ProductOrder.finished,
-            )
+            .where(models.ProductOrder.items_count > 0)
             .order_by(models.ProductOrder.id.desc())
         )
-        stmt = self.apply_keyword_sales_filter(stmt, orders_request.keyword)
-        stmt = self.apply_user_id_filter(stmt, request)
-        pagination_info = await self.get_pagination_info(stmt)
-        stmt = self.apply_pagination(stmt, orders_request.pagination)
+        stmt = self.apply_keyword_sales_filter(stmt, keyword)
+        return self.apply_user_id_filter(stmt, principal)
 
-        result = await self.session.execute(stmt)
+    async def list_product_orders(
+        self, orders_request: products_schemas.ProductOrdersRequest, principal: TokenDataSchema
+    ) -> products_schemas.ProductOrderResponse:
+        stmt = self.product_orders_stmt(orders_request.keyword, principal)
+        rows, pagination_info = await self.paginate(stmt, orders_request.pagination, models.ProductOrder.id)
         products: list[products_schemas.ProductOrderItem] = []
-        for row in result.all():
+        for row in rows:
             products.append(
                 products_schemas.ProductOrderItem(
                     id=row.id,
@@ -188,24 +450,71 @@ class ProductsService(BaseService):
             pagination_info=pagination_info,
         )
 
+    @staticmethod
+    def order_totals_update(order_id: int):
+        """UPDATE recomputing the materialized totals of an order from its sales requests."""
+        requests = select().where(models.SalesRequests.product_order_id == order_id)
+        return (
+            update(models.ProductOrder)
+            .where(models.ProductOrder.id == order_id)
+            .values(
+                total_price=requests.add_columns(
+                    func.coalesce(func.sum(models.SalesRequests.price * models.SalesRequests.quantity), 0)
+                ).scalar_subquery(),
+                total_income=requests.add_columns(
+                    func.coalesce(func.sum(models.SalesRequests.income * models.SalesRequests.quantity), 0)
+                ).scalar_subquery(),
+                items_count=requests.add_columns(func.count()).scalar_subquery(),
+            )
+        )
+
+    def export_orders_stmt(self, keyword: str, principal: TokenDataSchema):
+        stmt = (
+            select(
+                models.ProductOrder.id,
+                models.ProductOrder.realization_date.label("date"),
+                models.User.username,
+                models.ProductOrder.total_price.label("price"),
+                models.ProductOrder.total_income.label("income"),
+                models.ProductOrder.items_count,
+                models.ProductOrder.finished,
+            )
+            .join(models.User, models.ProductOrder.user_id == models.User.id)
+            .where(models.ProductOrder.items_count > 0)
+            .order_by(models.ProductOrder.id)
+        )
+        stmt = self.apply_keyword_sales_filter(stmt, keyword)
+        return self.apply_user_id_filter(stmt, principal)
+
     async def finish_order(self, order_id: int) -> OkResponseSchema:
-        stmt = select(models.ProductOrder).where(models.ProductOrder.id == order_id)
+        # the row lock keeps concurrent calls from adding the order to the rollups twice
+        stmt = select(models.ProductOrder).where(models.ProductOrder.id == order_id).with_for_update()
         result = await self.session.execute(stmt)
         order = result.scalars().first()
         if not order:
             return OkResponseSchema(ok=False, message="Заказ не найден")
-        order.finished = True
+        if not order.finished:
+            order.finished = True
+            await self.session.execute(ReportsService.order_finished_rollup(order_id))
         await self.session.commit()
+        await pdf_cache.invalidate(order_id)
         return OkResponseSchema(ok=True)
 
-    async def get_order_pdf(self, order_id: int) -> base_schemas.FileResponse:
+    async def get_order_pdf_context(
+        self, order_id: int, principal: TokenDataSchema | None = None
+    ) -> tuple[models.ProductOrder, dict]:
         stmt = (
             select(models.ProductOrder)
             .where(models.ProductOrder.id == order_id)
             .options(joinedload(models.ProductOrder.requests).joinedload(models.SalesRequests.product))
         )
+        if principal is not None:
+            # another seller's order is reported as missing
+            stmt = self.apply_user_id_filter(stmt, principal)
         result = await self.session.execute(stmt)
-        order: models.ProductOrder = result.scalars().first()
+        order: models.ProductOrder | None = result.scalars().first()
+        if not order:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Заказ не найден")
 
         product_summary = {}
         final_product_price = 0
@@ -239,17 +548,28 @@ class ProductsService(BaseService):
             for item in product_summary.values()
         ]
 
-        final_html = TEMPLATES.get_template("product_order.html").render(
-            date_from=order.realization_date.strftime("%d.%m.%Y"),
-            products=products,
-            final_product_price=(
+        context = {
+            "date_from": order.realization_date.strftime("%d.%m.%Y"),
+            "products": products,
+            "final_product_price": (
                 f"{final_product_price:.2f}" if final_product_price % 1 != 0 else f"{final_product_price:.0f}"
             ),
-            final_income=f"{final_income:.2f}" if final_income % 1 != 0 else f"{final_income:.0f}",
-            finished=order.finished,
-        )
+            "final_income": f"{final_income:.2f}" if final_income % 1 != 0 else f"{final_income:.0f}",
+            "finished": order.finished,
+        }
+        return order, context
+
+    @staticmethod
+    async def render_order_pdf(cache_key: str, context: dict) -> bytes:
+        pdf = await pdf_cache.get(cache_key)
+        if pdf is None:
+            pdf = await pdf_renderer.render(ORDER_PDF_TEMPLATE, context)
+            await pdf_cache.set(cache_key, pdf)
+        return pdf
 
-        pdf = HTML(string=final_html).write_pdf()
+    async def get_order_pdf(self, order_id: int) -> base_schemas.FileResponse:
+        order, context = await self.get_order_pdf_context(order_id)
+        pdf = await self.render_order_pdf(pdf_cache.key(order.id, ORDER_PDF_TEMPLATE, context), context)
         encoded_pdf = base64.b64encode(pdf).decode("ascii")
         random_filename = f"order_{order.id}_{os.urandom(8).hex()}.pdf"
 
@@ -259,69 +579,130 @@ class ProductsService(BaseService):
             file_name=random_filename,
         )
 
+    @staticmethod
+    def etag_matches(request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == etag:
+                return True
+        return False
+
+    async def stream_order_pdf(self, order_id: int, request: Request, principal: TokenDataSchema) -> Response:
+        order, context = await self.get_order_pdf_context(order_id, principal)
+        cache_key = pdf_cache.key(order.id, ORDER_PDF_TEMPLATE, context)
+        headers = {
+            "ETag": f'"{cache_key}"',
+            "Cache-Control": "private, no-cache",
+        }
+        if self.etag_matches(request, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        pdf = await self.render_order_pdf(cache_key, context)
+
+        def iterate_chunks():
+            view = memoryview(pdf)
+            for offset in range(0, len(view), PDF_CHUNK_SIZE):
+                yield bytes(view[offset : offset + PDF_CHUNK_SIZE])
+
+        headers["Content-Disposition"] = f'attachment; filename="order_{order.id}.pdf"'
+        return StreamingResponse(iterate_chunks(), media_type="application/pdf", headers=headers)
+
     @staticmethod
     def apply_sales_keyword_filter(stmt, keyword):
         if keyword:
             stmt = stmt.where(
-                or_(
-                    models.Product.article.ilike(f"%{keyword}%"),
-                    models.Product.name.ilike(f"%{keyword}%"),
-                )
+                search.keyword_condition(keyword, models.Product.article, models.Product.name),
             )
         return stmt
 
     @staticmethod
-    def apply_sales_user_id_filter(stmt, request: Request):
-        user_id = SecurityService.get_user_id(request)
-        stmt = stmt.where(models.SalesRequests.user_id == user_id)
+    def apply_sales_user_id_filter(stmt, principal: TokenDataSchema):
+        stmt = stmt.where(models.SalesRequests.user_id == principal.user_id)
         return stmt
 
-    async def get_sales_requests(self, request: Request) -> products_schemas.SalesUserResponse:
+    def sales_requests_stmt(self, keyword: str, principal: TokenDataSchema):
         stmt = (
-            select(models.SalesRequests)
+            select(
+                models.SalesRequests.id,
+                models.Product.name.label("product_name"),
+                models.SalesRequests.price,
+                models.SalesRequests.quantity,
+                models.SalesRequests.income,
+            )
+            .join(models.Product, models.SalesRequests.product_id == models.Product.id)
             .order_by(models.SalesRequests.id.desc())
             .where(models.SalesRequests.product_order_id == None)
         )
-        stmt = stmt.options(joinedload(models.SalesRequests.product))
-        stmt = self.apply_sales_user_id_filter(stmt, request)
+        stmt = self.apply_sales_keyword_filter(stmt, keyword)
+        return self.apply_sales_user_id_filter(stmt, principal)
 
-        result = await self.session.execute(stmt)
-        rows: Sequence[models.SalesRequests] = result.scalars().all()
-        products: list[products_schemas.SalesItem] = []
-        for row in rows:
-            products.append(
-                products_schemas.SalesItem(
-                    id=row.id,
-                    income=row.income,
-                    product_name=row.product.name,
-                    quantity=row.quantity,
-                    price=row.price,
-                )
-            )
+    async def get_sales_requests(
+        self, sales_request_filter: products_schemas.SalesRequestFilter, principal: TokenDataSchema
+    ) -> products_schemas.SalesUserResponse:
+        stmt = self.sales_requests_stmt(sales_request_filter.keyword, principal)
+        rows, pagination_info = await self.paginate(stmt, sales_request_filter.pagination, models.SalesRequests.id)
 
-        return products_schemas.SalesUserResponse(items=products)
+        return products_schemas.SalesUserResponse(
+            items=self.project(SALES_ITEMS, rows),
+            pagination_info=pagination_info,
+        )
+
+    def export_sales_stmt(self, keyword: str, principal: TokenDataSchema):
+        stmt = (
+            select(
+                models.SalesRequests.id,
+                models.SalesRequests.product_order_id,
+                models.SalesRequests.user_id,
+                models.Product.article,
+                models.Product.name.label("product_name"),
+                models.SalesRequests.price,
+                models.SalesRequests.quantity,
+                models.SalesRequests.income,
+            )
+            .join(models.Product, models.SalesRequests.product_id == models.Product.id)
+            .order_by(models.SalesRequests.id)
+        )
+        stmt = self.apply_sales_keyword_filter(stmt, keyword)
+        if not SecurityService.is_admin_principal(principal):
+            stmt = self.apply_sales_user_id_filter(stmt, principal)
+        return stmt
 
     async def create_product_order(
         self,
         create_request: products_schemas.CreateProductOrderRequest,
-        request: Request,
-    ) -> OkResponseSchema:
-        stmt = select(models.SalesRequests).where(models.SalesRequests.id.in_(create_request.ids))
-        result = await self.session.execute(stmt)
-        sales_requests: Sequence[models.SalesRequests] = result.scalars().all()
-
-        if not sales_requests:
-            return OkResponseSchema(ok=False, message="Запросы на продажу не найдены")
-
-        user_id = SecurityService.get_user_id(request)
+        principal: TokenDataSchema,
+    ) -> products_schemas.CreateProductOrderResponse:
+        if not create_request.ids:
+            return products_schemas.CreateProductOrderResponse(ok=False, message="Запросы на продажу не найдены")
 
-        new_order = models.ProductOrder(user_id=user_id)
-        self.session.add(new_order)
-        await self.session.commit()
+        result = await self.session.execute(
+            insert(models.ProductOrder).values(user_id=principal.user_id).returning(models.ProductOrder.id)
+        )
+        order_id: int = result.scalar_one()
+
+        attach_stmt = (
+            update(models.SalesRequests)
+            .where(
+                models.SalesRequests.id == any_(cast(create_request.ids, ARRAY(Integer))),
+                models.SalesRequests.user_id == principal.user_id,
+                models.SalesRequests.product_order_id.is_(None),
+            )
+            .values(product_order_id=order_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(attach_stmt)
+        attached: int = result.rowcount
 
-        for create_request in sales_requests:
-            create_request.product_order_id = new_order.id
+        if not attached:
+            await self.session.rollback()
+            return products_schemas.CreateProductOrderResponse(ok=False, message="Запросы на продажу не найдены")
 
+        await self.session.execute(self.order_totals_update(order_id))
+        await self.session.execute(ReportsService.order_created_rollup(order_id))
         await self.session.commit()
+        await pdf_cache.invalidate(order_id)
 
-        return OkResponseSchema(ok=True)
+        return products_schemas.CreateProductOrderResponse(ok=True, order_id=order_id, attached=attached)
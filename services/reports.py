@@ -0,0 +1,219 @@
+from pydantic import TypeAdapter
+from sqlalchemy import Date, Integer, case, cast, delete, func, literal, or_, select, text
+from sqlalchemy.dialects import postgresql
+
+import models
+import schemas.reports as reports_schemas
+from services.base import BaseService
+
+ROLLUP_KEYS = ("day", "product_id", "user_id")
+ROLLUP_MEASURES = (
+    "requests_count",
+    "quantity",
+    "revenue",
+    "income",
+    "finished_quantity",
+    "finished_revenue",
+    "finished_income",
+)
+# Money measures are sums of doubles, differences below this are rounding
+ROLLUP_TOLERANCE = 0.005
+# The consistency checker reports at most this many mismatching rows
+ROLLUP_CHECK_LIMIT = 1000
+
+SALES_REPORT_ROWS = TypeAdapter(list[reports_schemas.SalesReportRow])
+
+
+class ReportsService(BaseService):
+    """Sales reports over ``sales_daily_rollups``, one row per day, product and seller.
+
+    A sales request counts on the realization day of the order it is attached
+    to. Rollups are updated in the transactions of create_product_order and
+    finish_order; ``rebuild_rollups`` recomputes a date range from the raw rows.
+    """
+
+    @staticmethod
+    def rollup_totals(*conditions):
+        """Rollup rows aggregated from the sales requests attached to orders."""
+        sales = models.SalesRequests
+        orders = models.ProductOrder
+        day = cast(orders.realization_date, Date)
+        revenue = sales.price * sales.quantity
+        income = sales.income * sales.quantity
+        return (
+            select(
+                day.label("day"),
+                sales.product_id,
+                sales.user_id,
+                func.count().label("requests_count"),
+                func.sum(sales.quantity).label("quantity"),
+                func.sum(revenue).label("revenue"),
+                func.sum(income).label("income"),
+                func.sum(case((orders.finished, sales.quantity), else_=0)).label("finished_quantity"),
+                func.sum(case((orders.finished, revenue), else_=0)).label("finished_revenue"),
+                func.sum(case((orders.finished, income), else_=0)).label("finished_income"),
+            )
+            .join(orders, sales.product_order_id == orders.id)
+            .where(*conditions)
+            .group_by(day, sales.product_id, sales.user_id)
+        )
+
+    @staticmethod
+    def finished_totals(order_id: int):
+        """Rollup increments of finishing an order, only the finished_* measures are set."""
+        sales = models.SalesRequests
+        orders = models.ProductOrder
+        day = cast(orders.realization_date, Date)
+        return (
+            select(
+                day.label("day"),
+                sales.product_id,
+                sales.user_id,
+                literal(0, Integer).label("requests_count"),
+                literal(0, Integer).label("quantity"),
+                literal(0.0).label("revenue"),
+                literal(0.0).label("income"),
+                func.sum(sales.quantity).label("finished_quantity"),
+                func.sum(sales.price * sales.quantity).label("finished_revenue"),
+                func.sum(sales.income * sales.quantity).label("finished_income"),
+            )
+            .join(orders, sales.product_order_id == orders.id)
+            .where(orders.id == order_id)
+            .group_by(day, sales.product_id, sales.user_id)
+        )
+
+    @staticmethod
+    def rollup_upsert(totals, replace: bool = False):
+        """INSERT ... SELECT of ``totals`` into the rollups, adding to existing rows unless ``replace``."""
+        rollup = models.SalesDailyRollup.__table__
+        stmt = postgresql.insert(rollup).from_select(ROLLUP_KEYS + ROLLUP_MEASURES, totals)
+        return stmt.on_conflict_do_update(
+            index_elements=ROLLUP_KEYS,
+            set_={
+                measure: stmt.excluded[measure] if replace else rollup.c[measure] + stmt.excluded[measure]
+                for measure in ROLLUP_MEASURES
+            },
+        )
+
+    @classmethod
+    def order_created_rollup(cls, order_id: int):
+        return cls.rollup_upsert(cls.rollup_totals(models.ProductOrder.id == order_id))
+
+    @classmethod
+    def order_finished_rollup(cls, order_id: int):
+        return cls.rollup_upsert(cls.finished_totals(order_id))
+
+    @staticmethod
+    def day_range(column, rollup_range: reports_schemas.RollupRange):
+        return column.between(rollup_range.date_from, rollup_range.date_to)
+
+    async def rebuild_rollups(self, rollup_range: reports_schemas.RollupRange) -> reports_schemas.RollupRebuildResponse:
+        """Recompute the rollups of a date range from the raw sales requests.
+
+        The table lock waits for running order transactions and holds new
+        ones back, so no increment is lost or counted twice.
+        """
+        rollup = models.SalesDailyRollup
+        await self.session.execute(text(f"LOCK TABLE {rollup.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+        await self.session.execute(delete(rollup).where(self.day_range(rollup.day, rollup_range)))
+        totals = self.rollup_totals(self.day_range(cast(models.ProductOrder.realization_date, Date), rollup_range))
+        result = await self.session.execute(self.rollup_upsert(totals, replace=True))
+        await self.session.commit()
+        return reports_schemas.RollupRebuildResponse(ok=True, rows=result.rowcount)
+
+    async def check_rollups(self, rollup_range: reports_schemas.RollupRange) -> reports_schemas.RollupCheckResponse:
+        """Compare the rollups of a date range with totals computed from the raw sales requests."""
+        rollup = models.SalesDailyRollup.__table__
+        raw = self.rollup_totals(
+            self.day_range(cast(models.ProductOrder.realization_date, Date), rollup_range)
+        ).subquery("raw")
+        stored = select(rollup).where(self.day_range(rollup.c.day, rollup_range)).subquery("stored")
+
+        keys = [func.coalesce(stored.c[key], raw.c[key]).label(key) for key in ROLLUP_KEYS]
+        measures = [
+            column
+            for measure in ROLLUP_MEASURES
+            for column in (
+                func.coalesce(stored.c[measure], 0).label(f"stored_{measure}"),
+                func.coalesce(raw.c[measure], 0).label(f"raw_{measure}"),
+            )
+        ]
+        differs = or_(
+            *(
+                func.abs(func.coalesce(stored.c[measure], 0) - func.coalesce(raw.c[measure], 0)) > ROLLUP_TOLERANCE
+                for measure in ROLLUP_MEASURES
+            )
+        )
+        on = (
+            (stored.c.day == raw.c.day)
+            & (stored.c.product_id == raw.c.product_id)
+            & (stored.c.user_id == raw.c.user_id)
+        )
+        stmt = (
+            select(*keys, *measures, func.count().over().label("row_count"))
+            .select_from(stored.join(raw, on, full=True))
+            .where(differs)
+            .order_by(*keys)
+            .limit(ROLLUP_CHECK_LIMIT)
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        checked = await self.session.scalar(select(func.count()).select_from(stored.join(raw, on, full=True)))
+        mismatches = [
+            reports_schemas.RollupMismatch(
+                day=row.day,
+                product_id=row.product_id,
+                user_id=row.user_id,
+                field=measure,
+                rollup=row._mapping[f"stored_{measure}"],
+                raw=row._mapping[f"raw_{measure}"],
+            )
+            for row in rows
+            for measure in ROLLUP_MEASURES
+            if abs(row._mapping[f"stored_{measure}"] - row._mapping[f"raw_{measure}"]) > ROLLUP_TOLERANCE
+        ]
+        mismatched_rows = rows[0].row_count if rows else 0
+        return reports_schemas.RollupCheckResponse(
+            ok=not mismatches,
+            message=f"Расхождения в {mismatched_rows} строках" if mismatches else "",
+            checked=checked,
+            mismatches=mismatches,
+        )
+
+    async def get_sales_report(self, report_request: reports_schemas.SalesReportRequest) -> reports_schemas.SalesReport:
+        rollup = models.SalesDailyRollup
+        prefix = "finished_" if report_request.finished_only else ""
+        quantity = func.sum(getattr(rollup, f"{prefix}quantity"))
+        revenue = func.sum(getattr(rollup, f"{prefix}revenue"))
+        columns = [
+            quantity.label("quantity"),
+            revenue.label("revenue"),
+            func.sum(getattr(rollup, f"{prefix}income")).label("income"),
+        ]
+        groups = []
+        order_by = [revenue.desc()]
+
+        if report_request.period == reports_schemas.ReportPeriod.DAY:
+            groups.append(rollup.day.label("period_start"))
+        elif report_request.period == reports_schemas.ReportPeriod.WEEK:
+            groups.append(cast(func.date_trunc("week", rollup.day), Date).label("period_start"))
+        if groups:
+            order_by.insert(0, groups[0])
+
+        stmt = select(rollup).where(self.day_range(rollup.day, report_request))
+        if report_request.by_product:
+            stmt = stmt.join(models.Product, rollup.product_id == models.Product.id)
+            groups += [rollup.product_id, models.Product.article, models.Product.name.label("product_name")]
+        if report_request.by_seller:
+            stmt = stmt.join(models.User, rollup.user_id == models.User.id)
+            groups += [rollup.user_id, models.User.username]
+
+        stmt = stmt.with_only_columns(*groups, *columns).group_by(*groups).having(quantity > 0).order_by(*order_by)
+        result = await self.session.execute(stmt)
+        rows = self.project(SALES_REPORT_ROWS, result.all())
+        return reports_schemas.SalesReport(
+            rows=rows,
+            quantity=sum(row.quantity for row in rows),
+            revenue=sum(row.revenue for row in rows),
+            income=sum(row.income for row in rows),
+        )
@@ -0,0 +1,23 @@
+from sqlalchemy import func, or_
+
+# Text search configuration of the products.search_vector column
+SEARCH_CONFIG = "russian"
+
+
+def escape_like(keyword: str) -> str:
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def keyword_condition(keyword: str, *columns):
+    """Substring match over ``columns``, served by their ``gin_trgm_ops`` indexes."""
+    pattern = f"%{escape_like(keyword)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def fulltext_condition(keyword: str, vector_column):
+    return vector_column.op("@@")(func.plainto_tsquery(SEARCH_CONFIG, keyword))
+
+
+def relevance(keyword: str, *columns):
+    """Best trigram word similarity of ``keyword`` against ``columns``, from 0 to 1."""
+    return func.greatest(*(func.word_similarity(keyword, column) for column in columns))
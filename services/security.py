@@ -1,4 +1,4 @@
-from collections.abc import Callable, Sequence
+from collections.abc import Callable
 from functools import reduce
 from time import time
 
@@ -6,15 +6,32 @@ from fastapi import HTTPException, status
 from fastapi.requests import Request
 from fastapi.responses import Response
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 import models
 import schemas.security as security_schemas
-from backend.config import SECRET_KEY, SECURITY_ALGORITHM
+from backend.cache import TTLCache
+from backend.config import (
+    EMPLOYEE_CACHE_SIZE,
+    EMPLOYEE_CACHE_TTL,
+    JWT_CACHE_SIZE,
+    JWT_CACHE_TTL,
+    SECRET_KEY,
+    SECURITY_ALGORITHM,
+)
+from backend.instrumentation import instrumentation
+from backend.passwords import password_hasher
 from schemas.base import OkResponseSchema
 from schemas.security import Permission
+from services import search
 from services.base import BaseService
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import and_, literal, literal_column, select
+
+USER_ITEMS = TypeAdapter(list[security_schemas.UserDataRequest])
+EMPLOYEE_ITEMS = TypeAdapter(list[security_schemas.Employee])
+
+jwt_cache = TTLCache(size=JWT_CACHE_SIZE, ttl=JWT_CACHE_TTL)
+employee_cache = TTLCache(size=EMPLOYEE_CACHE_SIZE, ttl=EMPLOYEE_CACHE_TTL)
 
 
 class SecurityService(BaseService):
@@ -25,7 +42,8 @@ class SecurityService(BaseService):
             iat=int(time()),
             user_id=user_id,
         ).serialize()
-        token = jwt.encode(to_encode, SECRET_KEY, algorithm=SECURITY_ALGORITHM)
+        with instrumentation.timed("jwt"):
+            token = jwt.encode(to_encode, SECRET_KEY, algorithm=SECURITY_ALGORITHM)
         return token
 
     @staticmethod
@@ -38,25 +56,43 @@ class SecurityService(BaseService):
         return x | y
 
     @staticmethod
-    def verify_jwt(token: str, required_permissions: list[security_schemas.Permission]) -> None:
+    def decode_jwt(token: str) -> security_schemas.TokenDataSchema:
+        """Verify ``token`` and return its claims, memoized per token in ``jwt_cache``."""
+        claims = jwt_cache.get(token)
+        if claims is not None:
+            return claims
+
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[SECURITY_ALGORITHM])
-            user_permissions = security_schemas.TokenDataSchema.deserialize(payload).permission
-            has_required_permissions = True
+            with instrumentation.timed("jwt"):
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[SECURITY_ALGORITHM])
+        except JWTError as e:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
 
-            for permission in required_permissions:
-                if (permission & user_permissions) != permission:
-                    has_required_permissions = False
-                    break
+        claims = security_schemas.TokenDataSchema.deserialize(payload)
+        expires_at = payload.get("exp")
+        jwt_cache.set(token, claims, ttl=expires_at - time() if expires_at is not None else None)
+        return claims
 
-            if not has_required_permissions:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Insufficient permissions or invalid token",
-                ) from None
+    @staticmethod
+    def has_permissions(
+        claims: security_schemas.TokenDataSchema, required_permissions: list[security_schemas.Permission]
+    ) -> bool:
+        for permission in required_permissions:
+            if (permission & claims.permission) != permission:
+                return False
+        return True
 
-        except JWTError as e:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e)) from e
+    @staticmethod
+    def verify_jwt(
+        token: str, required_permissions: list[security_schemas.Permission]
+    ) -> security_schemas.TokenDataSchema:
+        claims = SecurityService.decode_jwt(token)
+        if not SecurityService.has_permissions(claims, required_permissions):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions or invalid token",
+            )
+        return claims
 
     async def login_user(self, user: security_schemas.UserLogin, response: Response) -> security_schemas.LoginResponse:
         stmt = select(models.User).where(models.User.username == user.username)
@@ -68,13 +104,17 @@ class SecurityService(BaseService):
                 detail="User not found",
             )
 
-        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        if not pwd_context.verify(user.password, db_user.password_hash):
+        verified, new_password_hash = await password_hasher.verify_and_update(user.password, db_user.password_hash)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
             )
 
+        if new_password_hash:
+            db_user.password_hash = new_password_hash
+            await self.session.commit()
+
         await self.set_jwt(db_user.permission, db_user.id, response)
 
         return security_schemas.LoginResponse(
@@ -84,15 +124,30 @@ class SecurityService(BaseService):
         )
 
     @staticmethod
-    def authenticate(required_permissions: list[security_schemas.Permission]) -> Callable:
-        def _authenticate(request: Request) -> None:
+    def get_principal(request: Request) -> security_schemas.TokenDataSchema:
+        """Claims of the request's token, decoded once and kept on ``request.state.principal``."""
+        principal = getattr(request.state, "principal", None)
+        if principal is None:
             token = request.cookies.get("access_token")
             if not token:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Missing token in cookies",
                 )
-            SecurityService.verify_jwt(token, required_permissions)
+            principal = SecurityService.decode_jwt(token)
+            request.state.principal = principal
+        return principal
+
+    @staticmethod
+    def authenticate(required_permissions: list[security_schemas.Permission]) -> Callable:
+        def _authenticate(request: Request) -> security_schemas.TokenDataSchema:
+            principal = SecurityService.get_principal(request)
+            if not SecurityService.has_permissions(principal, required_permissions):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Insufficient permissions or invalid token",
+                )
+            return principal
 
         return _authenticate
 
@@ -106,11 +161,11 @@ class SecurityService(BaseService):
                 message="Пользователь с таким именем уже существует",
             )
 
-        pwd_context = CryptContext(schemes=["bcrypt"])
-        password_hash = pwd_context.hash(user.password)
+        password_hash = await password_hasher.hash(user.password)
         new_user = models.User(username=user.username, password_hash=password_hash, permission=user.permission)
         self.session.add(new_user)
         await self.session.commit()
+        employee_cache.clear()
 
         return OkResponseSchema(
             ok=True,
@@ -120,35 +175,44 @@ class SecurityService(BaseService):
     @staticmethod
     def apply_keyword_filter(stmt, keyword: str):
         if keyword:
-            stmt = stmt.where(models.User.username.ilike(f"%{keyword}%"))
+            stmt = stmt.where(search.keyword_condition(keyword, models.User.username))
         return stmt
 
+    @staticmethod
+    def permission_condition(permission: int):
+        """Users holding every bit of ``permission``, whatever other bits they have.
+
+        One ``permission & bit = bit`` term per bit, with the bit inlined so the
+        planner can match the partial index of that bit.
+        """
+        bits = [1 << shift for shift in range(permission.bit_length()) if permission & (1 << shift)]
+        return and_(
+            *(models.User.permission.op("&")(literal_column(str(bit))) == literal_column(str(bit)) for bit in bits)
+        )
+
     @staticmethod
     def apply_permission_filter(stmt, permission: int | None):
         if permission:
-            stmt = stmt.where(models.User.permission == permission)
+            stmt = stmt.where(SecurityService.permission_condition(permission))
         return stmt
 
     async def list_users(self, user_list_filter: security_schemas.UserListFilter) -> security_schemas.UserList:
-        stmt = select(models.User).order_by(models.User.id.desc())
+        stmt = select(
+            models.User.id,
+            models.User.username,
+            literal("").label("password"),
+            models.User.permission,
+        ).order_by(models.User.id.desc())
         stmt = self.apply_keyword_filter(stmt, user_list_filter.keyword)
         stmt = self.apply_permission_filter(stmt, user_list_filter.permission)
 
-        pagination_info = await self.get_pagination_info(stmt)
-        stmt = self.apply_pagination(stmt, user_list_filter.pagination)
-
-        result = await self.session.execute(stmt)
-        rows: Sequence[models.User] = result.scalars().all()
-        items = []
-
-        for row in rows:
-            items.append(
-                security_schemas.UserDataRequest(
-                    username=row.username,
-                    password="",
-                    permission=row.permission,
-                )
-            )
+        rows, pagination_info = await self.paginate(
+            stmt,
+            user_list_filter.pagination,
+            models.User.id,
+            count_table=models.User.__tablename__,
+        )
+        items = self.project(USER_ITEMS, rows)
 
         return security_schemas.UserList(
             users=items,
@@ -167,36 +231,53 @@ class SecurityService(BaseService):
 
         db_user.permission = user.permission
         await self.session.commit()
+        employee_cache.clear()
 
         return OkResponseSchema(
             ok=True,
             message="",
         )
 
-    async def list_employees(self) -> security_schemas.EmployeeList:
-        stmt = select(models.User).where(models.User.permission == Permission.SELL_PRODUCTS)
-        result = await self.session.execute(stmt)
-        rows: Sequence[models.User] = result.scalars().all()
-        items = []
-
-        for row in rows:
-            items.append(
-                security_schemas.Employee(
-                    username=row.username,
-                    id=row.id,
-                )
-            )
+    def employees_stmt(self, keyword: str):
+        stmt = (
+            select(models.User.username, models.User.id)
+            .where(self.permission_condition(Permission.SELL_PRODUCTS))
+            .order_by(models.User.id.desc())
+        )
+        return self.apply_keyword_filter(stmt, keyword)
+
+    async def list_employees(
+        self, employee_list_filter: security_schemas.EmployeeListFilter
+    ) -> security_schemas.EmployeeList:
+        """A page of the users who may sell, cached per worker until a user is created or edited."""
+        cache_key = (
+            employee_list_filter.keyword,
+            employee_list_filter.page,
+            employee_list_filter.per_page,
+            employee_list_filter.after,
+            employee_list_filter.count_strategy,
+        )
+        employees = employee_cache.get(cache_key)
+        if employees is not None:
+            return employees
+
+        stmt = self.employees_stmt(employee_list_filter.keyword)
+        rows, pagination_info = await self.paginate(stmt, employee_list_filter, models.User.id)
+        employees = security_schemas.EmployeeList(
+            employees=self.project(EMPLOYEE_ITEMS, rows),
+            pagination_info=pagination_info,
+        )
+        employee_cache.set(cache_key, employees)
+        return employees
 
-        return security_schemas.EmployeeList(employees=items)
+    @staticmethod
+    def get_user_id(request: Request) -> int:
+        return SecurityService.get_principal(request).user_id
 
     @staticmethod
-    def get_user_id(request: Request):
-        token = request.cookies.get("access_token")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[SECURITY_ALGORITHM])
-        return security_schemas.TokenDataSchema.deserialize(payload).user_id
+    def is_admin(request: Request) -> bool:
+        return SecurityService.is_admin_principal(SecurityService.get_principal(request))
 
     @staticmethod
-    def is_admin(request: Request):
-        token = request.cookies.get("access_token")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[SECURITY_ALGORITHM])
-        return security_schemas.TokenDataSchema.deserialize(payload).permission == 7
+    def is_admin_principal(principal: security_schemas.TokenDataSchema) -> bool:
+        return principal.permission == 7
@@ -1,2 +1,10 @@
-alembic stamp head
-alembic upgrade head
\ No newline at end of file
+# Brings the database schema to the latest revision.
+# A database created before the migrations were checked in already has the
+# initial schema, and alembic_version may hold a locally generated revision
+# that is not in this chain. Run once with --existing to replace it with the
+# initial revision; the later migrations are then applied by the upgrade.
+set -e
+if [ "$1" = "--existing" ]; then
+    alembic stamp --purge 8c1d2e3f4a50
+fi
+alembic upgrade head